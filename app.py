@@ -1,6 +1,9 @@
 import os
-from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, render_template
+import json
+import time
+from functools import partial
+from datetime import datetime
+from flask import Flask, Request, Response, request, jsonify, render_template, url_for, make_response, stream_with_context
 from werkzeug.utils import secure_filename
 import spacy
 import nltk
@@ -8,13 +11,88 @@ import nltk
 from services.paper_processor import PaperProcessor
 from services.game_generator import GameGenerator
 from services.game_state import game_state_manager
+from services.job_queue import JobQueue, SQLiteJobStore, DONE, FAILED
+from services.pipeline import process_paper_job, describe_paper, pipeline_version, paper_id
+from services.summarizer import ABSTRACTIVE, SUMMARY_MODES
+from services.paper_cache import PaperCache
+from services.game_store import GameStore
+from services.game_payload import COMPACT_FORMAT, supported_encodings
+from services.upload_spool import SpoolWriter, UploadSpool, UploadTooLarge
+from services.model_registry import model_registry, preload_models
+from services.instrumentation import instrumentation
+from services.static_assets import GAME_SCRIPTS, register_vendor_assets, serve_fingerprinted_static
 
 app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['UPLOAD_FOLDER'] = os.environ.get('PAPERSCAPE_UPLOAD_FOLDER', 'uploads')
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['JOB_DATABASE'] = os.environ.get('PAPERSCAPE_JOB_DATABASE', 'jobs.sqlite3')
+app.config['JOB_WORKERS'] = int(os.environ.get('PAPERSCAPE_JOB_WORKERS', os.cpu_count() or 1))
+# Job pools are replaced after this many papers to shed memory leaked by the
+# NLP libraries; 0 keeps a pool for the life of the web worker
+app.config['JOB_MAX_TASKS_PER_POOL'] = int(os.environ.get('PAPERSCAPE_JOB_MAX_TASKS_PER_POOL', 0))
+app.config['PRELOAD_MODELS'] = os.environ.get('PAPERSCAPE_PRELOAD_MODELS', '').lower() in ('1', 'true', 'yes')
+app.config['PAPER_CACHE_DIR'] = os.environ.get('PAPERSCAPE_PAPER_CACHE_DIR', os.path.join('cache', 'papers'))
+app.config['PAPER_CACHE_MAX_BYTES'] = int(os.environ.get('PAPERSCAPE_PAPER_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+app.config['GAME_STORE_DIR'] = os.environ.get('PAPERSCAPE_GAME_STORE_DIR', 'games')
+app.config['GAME_STORE_MAX_BYTES'] = int(os.environ.get('PAPERSCAPE_GAME_STORE_MAX_BYTES', 256 * 1024 * 1024))
+# 'abstractive' (transformer) or 'extractive' (TextRank, for CPU-only hosts)
+app.config['DEFAULT_SUMMARY_MODE'] = os.environ.get('PAPERSCAPE_SUMMARY_MODE', ABSTRACTIVE)
+# Models loaded ahead of the first paper; the summarizer is only worth its
+# memory when summaries are abstractive by default, and is otherwise loaded
+# on first use
+app.config['PRELOADED_MODELS'] = ['spacy'] + (
+    ['summarizer'] if app.config['DEFAULT_SUMMARY_MODE'] == ABSTRACTIVE else []
+)
+# How often the progress stream checks for new job events, and sends a
+# keep-alive comment when there were none for this long
+app.config['EVENTS_POLL_SECONDS'] = 0.5
+app.config['EVENTS_KEEPALIVE_SECONDS'] = 15
+# Each open stream holds a request thread, so streams end after this long and
+# the browser reopens them where they left off
+app.config['EVENTS_MAX_STREAM_SECONDS'] = 60
+# How long a finished job's progress events are kept for late reconnects
+app.config['EVENTS_TTL_SECONDS'] = 3600
 
-# Ensure upload directory exists
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# Uploads are spooled by content hash until their processing job has read them;
+# anything older than a day was orphaned by a crashed worker
+upload_spool = UploadSpool(app.config['UPLOAD_FOLDER'], max_bytes=app.config['MAX_CONTENT_LENGTH'])
+upload_spool.sweep()
+
+
+class SpoolingRequest(Request):
+    """Has the form parser write uploaded files straight into the spool,
+    hashing them on the way, instead of into its own temporary files."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return upload_spool.writer()
+
+
+app.request_class = SpoolingRequest
+
+# Paper processing runs in background worker processes, each of which loads
+# the preloaded models once at startup (or inherits them if preloaded before forking)
+job_queue = JobQueue(
+    SQLiteJobStore(app.config['JOB_DATABASE']),
+    max_workers=app.config['JOB_WORKERS'],
+    initializer=partial(preload_models, app.config['PRELOADED_MODELS']),
+    max_tasks_per_pool=app.config['JOB_MAX_TASKS_PER_POOL'] or None,
+    events_ttl=app.config['EVENTS_TTL_SECONDS']
+)
+# Jobs left unfinished by a worker that has gone away are never completed
+job_queue.sweep()
+
+# Processed papers keyed by file hash; repeat uploads skip the pipeline
+paper_cache = PaperCache(
+    app.config['PAPER_CACHE_DIR'],
+    pipeline_version(),
+    max_bytes=app.config['PAPER_CACHE_MAX_BYTES']
+)
+
+# Games generated lazily from cached papers, served by /api/game/<id>
+game_store = GameStore(app.config['GAME_STORE_DIR'], paper_cache, max_bytes=app.config['GAME_STORE_MAX_BYTES'])
+
+# Templates link vendored client libraries through vendor_url()
+register_vendor_assets(app)
 
 # Custom Jinja2 filters
 @app.template_filter('datetime')
@@ -58,34 +136,202 @@ def upload_paper():
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
     
-    # Secure filename and save
+    summary_mode = request.form.get('summary_mode') or app.config['DEFAULT_SUMMARY_MODE']
+    if summary_mode not in SUMMARY_MODES:
+        return jsonify({'error': f'Unknown summary mode: {summary_mode}'}), 400
+
+    # The form parser already wrote and hashed the upload into the spool;
+    # Werkzeug enforces MAX_CONTENT_LENGTH while parsing
     filename = secure_filename(file.filename)
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    file.save(filepath)
-    
-    # Process the paper
+    extension = os.path.splitext(filename)[1]
+    if isinstance(file.stream, SpoolWriter):
+        digest, lease_path = upload_spool.commit(file.stream, extension)
+    else:
+        try:
+            digest, lease_path = upload_spool.spool(file.stream, extension)
+        except UploadTooLarge as e:
+            return upload_too_large(e)
+
+    # Identical papers have been processed before
+    processed_id = paper_id(digest, summary_mode)
+    paper_data = paper_cache.get(processed_id)
+    if paper_data is not None:
+        upload_spool.release(lease_path)
+        return jsonify({**describe_paper(processed_id, paper_data), 'cached': True}), 200
+
+    # Queue the paper for processing; the job releases the spooled file
     try:
-        processor = PaperProcessor(filepath)
-        key_concepts = processor.extract_key_concepts()
-        
-        # Generate games
-        game_generator = GameGenerator(key_concepts)
-        games = game_generator.create_games()
-        
-        return jsonify({
-            'message': 'Paper processed successfully',
-            'concepts': key_concepts,
-            'games': games
-        }), 200
-    
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        job = job_queue.submit(
+            process_paper_job, lease_path, digest, summary_mode, paper_cache, upload_spool,
+            metadata={'filename': filename, 'digest': digest, 'summary_mode': summary_mode}
+        )
+    except BaseException:
+        upload_spool.release(lease_path)
+        raise
+
+    return jsonify({
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': url_for('job_status', job_id=job['id']),
+        'events_url': url_for('job_events', job_id=job['id'])
+    }), 202
+
+@app.errorhandler(413)
+def upload_too_large(error):
+    """Reject uploads over MAX_CONTENT_LENGTH with a JSON error"""
+    return jsonify({'error': f"Upload exceeds {app.config['MAX_CONTENT_LENGTH']} bytes"}), 413
+
+@app.route('/upload/<job_id>/events')
+def job_events(job_id):
+    """Stream a processing job's stage progress as Server-Sent Events"""
+    if job_queue.get(job_id) is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    # EventSource resends the last id it saw when it reconnects
+    try:
+        last_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_id = 0
+    poll_seconds = app.config['EVENTS_POLL_SECONDS']
+    keepalive_seconds = app.config['EVENTS_KEEPALIVE_SECONDS']
+    max_stream_seconds = app.config['EVENTS_MAX_STREAM_SECONDS']
+
+    def stream(last_id):
+        started = last_sent = time.monotonic()
+        # Have the browser reconnect promptly when the stream is cut short
+        yield f"retry: {int(poll_seconds * 1000)}\n\n"
+        while True:
+            # Read the status first so no event recorded before the job
+            # finished can be missed
+            job = job_queue.get(job_id)
+            for event in job_queue.events(job_id, after=last_id):
+                last_id = event['id']
+                yield f"id: {last_id}\nevent: progress\ndata: {json.dumps(event)}\n\n"
+                last_sent = time.monotonic()
+
+            if job['status'] in (DONE, FAILED):
+                end = {'status': job['status'], 'error': job['error'],
+                       'result_url': url_for('job_result', job_id=job_id)}
+                yield f"event: end\ndata: {json.dumps(end)}\n\n"
+                return
+
+            if time.monotonic() - started >= max_stream_seconds:
+                return
+            if time.monotonic() - last_sent >= keepalive_seconds:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            time.sleep(poll_seconds)
+
+    response = Response(stream_with_context(stream(last_id)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report the status of a paper processing job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    return jsonify({
+        'job_id': job['id'],
+        'status': job['status'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at'],
+        'result_url': url_for('job_result', job_id=job['id'])
+    }), 200
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Return the games generated by a finished job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job['status'] == FAILED:
+        return jsonify({'error': job['error']}), 500
+    if job['status'] != DONE:
+        return jsonify({'job_id': job['id'], 'status': job['status']}), 202
+
+    return jsonify(job['result']), 200
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Report paper cache hit/miss counters and disk usage"""
+    return jsonify(paper_cache.stats()), 200
+
+@app.route('/models')
+def model_status():
+    """Report load state, load time and memory footprint of the NLP models"""
+    return jsonify({'pid': os.getpid(), 'models': model_registry.status()}), 200
+
+@app.route('/healthz')
+def health():
+    """Liveness: the worker is up and serving requests"""
+    return jsonify({'status': 'ok', 'pid': os.getpid()}), 200
+
+@app.route('/readyz')
+def readiness():
+    """Readiness: the job store is reachable and, when preloading, the models are loaded"""
+    models = model_registry.status()
+    checks = {'job_store': True, 'models': True}
+    try:
+        job_queue.get('readiness-check')
+    except Exception:
+        checks['job_store'] = False
+    if app.config['PRELOAD_MODELS']:
+        checks['models'] = all(models[name]['loaded'] for name in app.config['PRELOADED_MODELS'])
+
+    ready = all(checks.values())
+    return jsonify({
+        'status': 'ready' if ready else 'not ready',
+        'checks': checks,
+        'pid': os.getpid(),
+        'models': models
+    }), 200 if ready else 503
+
+@app.route('/metrics')
+def metrics():
+    """Export per-stage pipeline timings and memory in Prometheus text format"""
+    return Response(instrumentation.prometheus(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/play-game/<game_id>')
 def play_game(game_id):
     """Render a specific game"""
-    # Retrieve and render game based on game_id
-    return render_template('game.html', game_id=game_id)
+    # Retrieve and render game based on game_id, loading only the
+    # libraries this type of game uses
+    game_type = game_id.rpartition('_')[2]
+    return render_template('game.html', game_id=game_id, game_scripts=GAME_SCRIPTS.get(game_type, []))
+
+@app.route('/api/game/<game_id>')
+def get_game(game_id):
+    """Return one game, generating it on first request
+
+    ``?format=compact`` returns the string-table format decoded by
+    static/js/compact_payload.js.
+    """
+    processed_id, _, game_type = game_id.rpartition('_')
+    compact = request.args.get('format') == COMPACT_FORMAT
+    encoding = request.accept_encodings.best_match(supported_encodings())
+    try:
+        game = game_store.get_game(processed_id, game_type, compact=compact, encoding=encoding)
+    except ValueError:
+        game = None
+    if game is None:
+        return jsonify({'error': 'Unknown game'}), 404
+
+    payload, etag = game
+    response = make_response(payload)
+    response.mimetype = 'application/json'
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    # Games never change once generated, but revalidating is a cheap 304
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/progress')
 def view_progress():
@@ -93,82 +339,17 @@ def view_progress():
     # For demo purposes, using a fixed user_id
     user_id = "demo_user"
     
-    # Get user's progress data
-    progress_data = game_state_manager.get_user_progress(user_id)
-    achievements = game_state_manager.achievements.get(user_id, [])
-    
-    # Calculate statistics
-    total_games = len(progress_data)
-    total_completed = sum(1 for game in progress_data.values() if game.get('completion_percentage', 0) == 100)
-    total_points = sum(game.get('total_points', 0) for game in progress_data.values())
-    
-    # Prepare chart data
-    chart_dates = []
-    chart_points = []
-    current_date = datetime.now()
-    
-    for i in range(7):  # Last 7 days
-        date = current_date - timedelta(days=i)
-        date_str = date.strftime('%Y-%m-%d')
-        points = sum(
-            game.get('total_points', 0)
-            for game in progress_data.values()
-            if game.get('started_at', '').startswith(date_str)
-        )
-        chart_dates.insert(0, date.strftime('%b %d'))
-        chart_points.insert(0, points)
-    
-    # Prepare knowledge map data
-    knowledge_nodes = []
-    knowledge_links = []
-    node_id = 0
-    
-    for game_id, game_data in progress_data.items():
-        # Add game node
-        game_node = {
-            'id': f'game_{node_id}',
-            'label': game_data.get('type', 'Unknown Game'),
-            'group': 'game'
-        }
-        knowledge_nodes.append(game_node)
-        
-        # Add achievement nodes and links
-        for achievement in game_data.get('achievements', []):
-            node_id += 1
-            achievement_node = {
-                'id': f'achievement_{node_id}',
-                'label': achievement.get('name', 'Unknown Achievement'),
-                'group': 'achievement'
-            }
-            knowledge_nodes.append(achievement_node)
-            knowledge_links.append({
-                'source': game_node['id'],
-                'target': achievement_node['id']
-            })
-        
-        node_id += 1
+    # Totals, chart and knowledge map are maintained incrementally
+    dashboard = game_state_manager.get_dashboard(user_id)
     
-    return render_template('progress.html',
-        total_games=total_games,
-        total_completed=total_completed,
-        total_points=total_points,
-        recent_achievements=achievements[-5:],  # Show last 5 achievements
-        game_history=sorted(
-            [{'id': k, **v} for k, v in progress_data.items()],
-            key=lambda x: x.get('started_at', ''),
-            reverse=True
-        ),
-        chart_dates=chart_dates,
-        chart_points=chart_points,
-        knowledge_nodes=knowledge_nodes,
-        knowledge_links=knowledge_links
-    )
+    return render_template('progress.html', **dashboard)
 
 if __name__ == '__main__':
     # Development server
     app.run(debug=True)
 else:
-    # Production server
+    # Production server (see wsgi.py and gunicorn.conf.py)
     app.config['DEBUG'] = False
-    app.config['UPLOAD_FOLDER'] = '/home/yourusername/research-game-platform/uploads'  # Update this path on PythonAnywhere
-    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+    # Static files get fingerprinted URLs cached for a year; the development
+    # server keeps plain names so edited files show up on reload
+    static_manifest = serve_fingerprinted_static(app)
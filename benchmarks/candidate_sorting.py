@@ -0,0 +1,134 @@
+"""
+Benchmark of choosing the best candidate among a project's files.
+
+Sorts numpy-sized candidate lists the way pip used to, rebuilding the
+tag-priority map for every CandidateEvaluator and parsing every wheel filename
+each time it is looked at, and with the map built once per TargetPython and
+wheel filenames parsed once; then checks both ways pick the same candidate.
+Each round stands for one requirement on the project, as the resolver looks a
+project up again for every requirement on it.
+
+Usage: python -m benchmarks.candidate_sorting [--versions 300] [--rounds 20]
+                                              [--repeat 5] [--output report.json]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+from pip._vendor.packaging.specifiers import SpecifierSet
+from pip._vendor.packaging.tags import sys_tags
+from pip._vendor.packaging.version import Version
+
+from pip import __version__ as pip_version
+from pip._internal.index import package_finder
+from pip._internal.index.package_finder import CandidateEvaluator
+from pip._internal.models.candidate import InstallationCandidate
+from pip._internal.models.link import Link
+from pip._internal.models.target_python import TargetPython
+from pip._internal.models.wheel import Wheel
+
+PYTHONS = ['cp38', 'cp39', 'cp310', 'cp311', 'cp312']
+PLATFORMS = [
+    'manylinux_2_17_x86_64.manylinux2014_x86_64',
+    'manylinux_2_17_aarch64.manylinux2014_aarch64',
+    'musllinux_1_1_x86_64',
+    'macosx_10_9_x86_64',
+    'macosx_11_0_arm64',
+    'win32',
+    'win_amd64',
+]
+
+
+def synthetic_candidates(project: str, versions: int) -> List[InstallationCandidate]:
+    """An sdist and a wheel per Python version and platform for each release,
+    plus a wheel for the running interpreter so there is something to prefer."""
+    current = next(iter(sys_tags()))
+    candidates = []
+    for index in range(versions):
+        version = f"1.{index // 10}.{index % 10}"
+        filenames = [f"{project}-{version}.tar.gz"] + [
+            f"{project}-{version}-{python}-{python}-{plat}.whl"
+            for python in PYTHONS
+            for plat in PLATFORMS
+        ] + [f"{project}-{version}-{current.interpreter}-{current.abi}-{current.platform}.whl"]
+        for filename in filenames:
+            link = Link(f"https://files.example.org/packages/{filename}")
+            candidates.append(InstallationCandidate(project, version, link))
+    return candidates
+
+
+def _applicable(candidates: List[InstallationCandidate], target_python: TargetPython) -> List[InstallationCandidate]:
+    """The candidates the link evaluator would have let through: sdists and supported wheels."""
+    tags = target_python.get_unsorted_tags()
+    return [
+        candidate for candidate in candidates
+        if not candidate.link.is_wheel or Wheel(candidate.link.filename).supported(tags)
+    ]
+
+
+def run(mode: str, project: str, candidates: List[InstallationCandidate], rounds: int) -> Dict:
+    """Pick the best candidate ``rounds`` times with a fresh TargetPython."""
+    target_python = TargetPython()
+    target_python.get_sorted_tags()  # computing the tags is not what is measured
+    package_finder._parse_wheel_filename.cache_clear()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if mode == 'uncached':
+            package_finder._parse_wheel_filename.cache_clear()
+            evaluator = CandidateEvaluator(project, target_python.get_sorted_tags(), SpecifierSet())
+        else:
+            evaluator = CandidateEvaluator.create(project, target_python)
+        best = evaluator.sort_best_candidate(candidates)
+    return {'seconds': time.perf_counter() - start, 'best': best.link.filename}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--project', default='numpy')
+    parser.add_argument('--versions', type=int, default=300,
+                        help='releases of the synthetic project (default: 300)')
+    parser.add_argument('--rounds', type=int, default=20,
+                        help='requirements on the project, each sorting its candidates (default: 20)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    candidates = _applicable(synthetic_candidates(args.project, args.versions), TargetPython())
+    report: Dict = {
+        'pip': pip_version,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'supported_tags': len(TargetPython().get_sorted_tags()),
+        'candidates': len(candidates),
+        'rounds': args.rounds,
+        'repeat': args.repeat,
+    }
+    best = {}
+    for mode in ('uncached', 'cached'):
+        results = [run(mode, args.project, candidates, args.rounds) for _ in range(args.repeat)]
+        samples = [result['seconds'] for result in results]
+        best[mode] = results[0]['best']
+        report[mode] = {
+            'best': best[mode],
+            'median_seconds': round(statistics.median(samples), 6),
+            'min_seconds': round(min(samples), 6),
+        }
+    report['speedup'] = round(report['uncached']['median_seconds'] / report['cached']['median_seconds'], 2)
+    report['same_best'] = best['uncached'] == best['cached']
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+    return 0 if report['same_best'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
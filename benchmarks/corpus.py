@@ -0,0 +1,58 @@
+"""
+Synthetic research papers for benchmarking the paper pipeline.
+Papers are generated deterministically from a seed, so runs on different
+machines process identical input.
+"""
+
+import random
+from typing import List
+
+SUBJECTS = [
+    'The proposed method', 'Our approach', 'The neural network', 'This technique',
+    'The baseline model', 'The algorithm', 'The dataset', 'The attention mechanism',
+    'Gradient descent', 'The evaluation protocol', 'The encoder', 'Transfer learning'
+]
+VERBS = [
+    'is', 'improves', 'reduces', 'refers to', 'outperforms', 'shows', 'defines',
+    'depends on', 'requires', 'approximates', 'are compared with', 'generalizes'
+]
+OBJECTS = [
+    'the classification accuracy', 'a robust representation of the input',
+    'the convergence rate of training', 'state of the art results on benchmark tasks',
+    'the computational cost at inference time', 'a sparse matrix of features',
+    'the variance of the estimator', 'the result reported in prior work',
+    'a significant finding for the field', 'the loss function used for optimization',
+    'the conclusion drawn from the ablation study', 'the hyperparameters of the model'
+]
+QUALIFIERS = [
+    '', ' under realistic conditions', ' in the low data regime', ' across all experiments',
+    ' with a margin of 3 percent', ' according to Smith et al.', ' on the ImageNet benchmark'
+]
+
+SENTENCES_PER_PARAGRAPH = 6
+PARAGRAPHS_PER_PAGE = 5
+
+
+def generate_paper(pages: int, seed: int = 0) -> List[str]:
+    """Return the text of a synthetic paper as a list of pages."""
+    rng = random.Random(seed)
+    paper = []
+    for page in range(pages):
+        paragraphs = []
+        if page % 4 == 0:
+            paragraphs.append(f"{page // 4 + 1}. Section {page // 4 + 1}")
+        for _ in range(PARAGRAPHS_PER_PAGE):
+            sentences = [
+                f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}{rng.choice(QUALIFIERS)}."
+                for _ in range(SENTENCES_PER_PARAGRAPH)
+            ]
+            paragraphs.append(' '.join(sentences))
+        paper.append('\n\n'.join(paragraphs))
+    return paper
+
+
+def write_paper(path: str, pages: int, seed: int = 0) -> str:
+    """Write a synthetic paper as a plain-text file with form feeds between pages."""
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('\f'.join(generate_paper(pages, seed)))
+    return path
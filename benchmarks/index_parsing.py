@@ -0,0 +1,168 @@
+"""
+Benchmark of parsing large Simple API project pages.
+
+Parses each page in full, as pip used to, and with the link evaluator's URL
+pre-filter, which skips building Link objects for files that cannot be
+candidates; then evaluates the links and checks both ways find the same
+candidates. Pages are numpy-sized synthetic ones (JSON and HTML) unless
+captured pages are given: save them with e.g.
+
+    curl -H 'Accept: application/vnd.pypi.simple.v1+json' \\
+        https://pypi.org/simple/numpy/ > numpy.json
+
+Usage: python -m benchmarks.index_parsing [--page numpy.json ...]
+                                          [--versions 300] [--repeat 5]
+                                          [--output report.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+from pip import __version__ as pip_version
+from pip._internal.index.collector import IndexContent, parse_links
+from pip._internal.index.package_finder import LinkEvaluator, LinkType
+from pip._internal.models.target_python import TargetPython
+
+JSON_CONTENT_TYPE = 'application/vnd.pypi.simple.v1+json'
+HTML_CONTENT_TYPE = 'text/html'
+
+PYTHONS = ['cp38', 'cp39', 'cp310', 'cp311', 'cp312']
+PLATFORMS = [
+    'manylinux_2_17_x86_64.manylinux2014_x86_64',
+    'manylinux_2_17_aarch64.manylinux2014_aarch64',
+    'musllinux_1_1_x86_64',
+    'macosx_10_9_x86_64',
+    'macosx_11_0_arm64',
+    'win32',
+    'win_amd64',
+]
+
+
+def synthetic_files(project: str, versions: int) -> List[Dict]:
+    """PEP 691 file entries for ``versions`` releases, each with an sdist
+    and a wheel per Python version and platform."""
+    files = []
+    for index in range(versions):
+        version = f"1.{index // 10}.{index % 10}"
+        filenames = [f"{project}-{version}.tar.gz"] + [
+            f"{project}-{version}-{python}-{python}-{plat}.whl"
+            for python in PYTHONS
+            for plat in PLATFORMS
+        ]
+        for filename in filenames:
+            digest = hashlib.sha256(filename.encode()).hexdigest()
+            files.append({
+                'filename': filename,
+                'url': f"https://files.example.org/packages/{digest[:2]}/{digest[2:4]}/{filename}",
+                'hashes': {'sha256': digest},
+                'requires-python': '>=3.8',
+                'core-metadata': {'sha256': digest},
+                'yanked': False,
+            })
+    return files
+
+
+def json_page(project: str, files: List[Dict]) -> bytes:
+    return json.dumps({'meta': {'api-version': '1.1'}, 'name': project, 'files': files}).encode()
+
+
+def html_page(project: str, files: List[Dict]) -> bytes:
+    anchors = '\n'.join(
+        f'<a href="{file["url"]}#sha256={file["hashes"]["sha256"]}" '
+        f'data-requires-python="&gt;=3.8" '
+        f'data-dist-info-metadata="sha256={file["core-metadata"]["sha256"]}">{file["filename"]}</a><br/>'
+        for file in files
+    )
+    return f"<!DOCTYPE html><html><body><h1>Links for {project}</h1>\n{anchors}\n</body></html>".encode()
+
+
+def make_page(content: bytes, content_type: str, url: str) -> IndexContent:
+    # Index pages are not memoized in-process, like PyPI's
+    return IndexContent(content, content_type, encoding=None, url=url, cache_link_parsing=False)
+
+
+def run_page(name: str, page: IndexContent, evaluator: LinkEvaluator, repeat: int) -> Dict:
+    """Parse and evaluate one page ``repeat`` times each way."""
+    report: Dict = {'page': name, 'bytes': len(page.content)}
+    candidates: Dict[str, List[str]] = {}
+    for mode, link_filter in (('full', None), ('prefiltered', evaluator.may_be_candidate)):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            links = parse_links(page, link_filter)
+            found = [
+                link.url for link in links
+                if evaluator.evaluate_link(link)[0] == LinkType.candidate
+            ]
+            samples.append(time.perf_counter() - start)
+        candidates[mode] = found
+        report[mode] = {
+            'links_built': len(links),
+            'candidates': len(found),
+            'median_seconds': round(statistics.median(samples), 6),
+            'min_seconds': round(min(samples), 6),
+        }
+    report['speedup'] = round(report['full']['median_seconds'] / report['prefiltered']['median_seconds'], 2)
+    report['same_candidates'] = candidates['full'] == candidates['prefiltered']
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--page', nargs='+', default=[],
+                        help='captured project pages (.json for the JSON API, anything else is HTML)')
+    parser.add_argument('--project', default='numpy',
+                        help='project the pages belong to (default: numpy)')
+    parser.add_argument('--versions', type=int, default=300,
+                        help='releases on each synthetic page (default: 300)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    project = args.project
+    url = f"https://pypi.org/simple/{project}/"
+    pages = []
+    if args.page:
+        for path in args.page:
+            with open(path, 'rb') as file:
+                content = file.read()
+            content_type = JSON_CONTENT_TYPE if path.endswith('.json') else HTML_CONTENT_TYPE
+            pages.append((os.path.basename(path), make_page(content, content_type, url)))
+    else:
+        files = synthetic_files(project, args.versions)
+        pages.append(('synthetic.json', make_page(json_page(project, files), JSON_CONTENT_TYPE, url)))
+        pages.append(('synthetic.html', make_page(html_page(project, files), HTML_CONTENT_TYPE, url)))
+
+    evaluator = LinkEvaluator(
+        project_name=project,
+        canonical_name=project,
+        formats=frozenset({'binary', 'source'}),
+        target_python=TargetPython(),
+        allow_yanked=False,
+    )
+    report = {
+        'pip': pip_version,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'pages': [run_page(name, page, evaluator, args.repeat) for name, page in pages],
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+    return 0 if all(page['same_candidates'] for page in report['pages']) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Compare the per-page cost of parsing a paper twice with spaCy (once for key
+phrases, once for concepts) against the single-pass document analysis.
+
+Usage: python -m benchmarks.nlp_parse [--pages 10 20 40] [--repeat 3]
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import generate_paper
+from services.document_analysis import analyze_document
+from services.model_registry import model_registry
+
+
+def _double_parse(nlp, text):
+    # The pre-analysis pipeline: two full parses of the whole text
+    for _ in range(2):
+        doc = nlp(text)
+        for sent in doc.sents:
+            list(sent.noun_chunks)
+            [token.pos_ for token in sent]
+        list(doc.ents)
+
+
+def _single_parse(nlp, text):
+    analyze_document(nlp, [text])
+
+
+def _best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[5, 20, 40])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    nlp = model_registry.get('spacy')
+    print(f"{'pages':>6} {'before ms/page':>15} {'after ms/page':>14} {'speedup':>8}")
+    for pages in args.pages:
+        text = '\n\n'.join(generate_paper(pages))
+        before = _best_of(args.repeat, _double_parse, nlp, text) / pages * 1000
+        after = _best_of(args.repeat, _single_parse, nlp, text) / pages * 1000
+        print(f"{pages:>6} {before:>15.1f} {after:>14.1f} {before / after:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
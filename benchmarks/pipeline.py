@@ -0,0 +1,124 @@
+"""
+End-to-end benchmark of the paper -> games pipeline.
+
+Runs PaperProcessor and GameGenerator over synthetic papers of several sizes
+and writes a JSON report with throughput (pages/s), per-stage latency
+percentiles and peak memory. The transformer summarizer is replaced by a
+deterministic fake, so the benchmark runs on CPU-only machines and reports
+from different runs are comparable; spaCy is the real model.
+
+Usage: python -m benchmarks.pipeline [--pages 1 10 50 100] [--repeat 5]
+                                     [--summary-mode abstractive] [--output report.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Sequence
+
+from benchmarks.corpus import write_paper
+from services.game_generator import GameGenerator
+from services.instrumentation import peak_rss
+from services.model_registry import model_registry
+from services.paper_processor import PaperProcessor, PIPELINE_VERSION
+from services.summarizer import SUMMARY_MODES, ABSTRACTIVE
+
+PERCENTILES = (50, 90, 99)
+
+
+class FakeSummarizer:
+    """Stands in for the transformer pipeline: summarizes each chunk as its
+    first ``max_length`` words, with no model and no randomness."""
+
+    def __call__(self, chunks: Sequence[str], max_length: int = 130, **kwargs) -> List[Dict]:
+        return [{'summary_text': ' '.join(chunk.split()[:max_length])} for chunk in chunks]
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _summarize_latencies(samples: List[float]) -> Dict[str, float]:
+    report = {f"p{pct}": round(percentile(samples, pct), 6) for pct in PERCENTILES}
+    report['mean'] = round(sum(samples) / len(samples), 6)
+    return report
+
+
+def run_size(path: str, pages: int, repeat: int, summary_mode: str) -> Dict:
+    """Process one paper ``repeat`` times and report its stage latencies."""
+    stages: Dict[str, List[float]] = defaultdict(list)
+    totals = []
+
+    for _ in range(repeat):
+        events = []
+        start = time.perf_counter()
+        paper_data = PaperProcessor().process_paper(path, summary_mode=summary_mode, progress=events.append)
+        for game_type in GameGenerator.GAME_INFO:
+            game_start = time.perf_counter()
+            GameGenerator(paper_data).generate_game(game_type)
+            stages[f"game_{game_type}"].append(time.perf_counter() - game_start)
+        totals.append(time.perf_counter() - start)
+
+        for event in events:
+            if event['status'] == 'done':
+                stages[event['stage']].append(event['seconds'])
+
+    return {
+        'pages': pages,
+        'runs': repeat,
+        'concepts': len(paper_data['concepts']),
+        'pages_per_second': round(pages * repeat / sum(totals), 3),
+        'total_seconds': _summarize_latencies(totals),
+        'stages': {stage: _summarize_latencies(samples) for stage, samples in stages.items()},
+        'peak_rss_bytes': peak_rss()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 50, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--summary-mode', choices=SUMMARY_MODES, default=ABSTRACTIVE)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    model_registry.register('summarizer', FakeSummarizer)
+    # Load spaCy up front so the first run doesn't pay for it
+    model_registry.get('spacy')
+
+    results = []
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        for pages in args.pages:
+            path = write_paper(os.path.join(corpus_dir, f"paper_{pages}.txt"), pages, args.seed)
+            # One untimed run warms caches and lazily built pipeline state
+            PaperProcessor().process_paper(path, summary_mode=args.summary_mode)
+            results.append(run_size(path, pages, args.repeat, args.summary_mode))
+            print(f"{pages:>4} pages: {results[-1]['pages_per_second']:.2f} pages/s", file=sys.stderr)
+
+    report = {
+        'pipeline_version': PIPELINE_VERSION,
+        'summary_mode': args.summary_mode,
+        'seed': args.seed,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
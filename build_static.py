@@ -1,19 +1,173 @@
+"""
+Freeze the app into static files for GitHub Pages.
+
+Builds are incremental: a manifest in the build directory records a hash of
+the app's code, of every template each page rendered and of the static
+assets, and a page is only rendered again when one of those changed or its
+file is missing. Static files are hard-linked (or copied, across devices)
+under both their own and a fingerprinted name, and pages link to the
+fingerprinted one so it can be cached forever. Pinned client libraries are
+vendored first (see vendor_assets.py), so pages never fall back to CDNs.
+
+Usage: python build_static.py [--full]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
 import os
 import shutil
+
+from flask import template_rendered
 from flask_frozen import Freezer
-from app import app
 
-# Create build directory
-build_dir = 'build'
-if os.path.exists(build_dir):
-    shutil.rmtree(build_dir)
-os.makedirs(build_dir)
+from services.game_generator import GameGenerator
+from services.static_assets import file_digest
+from vendor_assets import vendor
+
+BUILD_DIR = 'build'
+MANIFEST_NAME = '.freeze-manifest.json'
+
+# Changes to these invalidate every page
+CODE_PATTERNS = ['app.py', os.path.join('services', '*.py')]
+
+
+def _code_digest(app) -> str:
+    hasher = hashlib.sha256()
+    for path in sorted(p for pattern in CODE_PATTERNS for p in glob.glob(os.path.join(app.root_path, pattern))):
+        hasher.update(os.path.relpath(path, app.root_path).encode('utf-8'))
+        hasher.update(file_digest(path).encode('ascii'))
+    return hasher.hexdigest()
+
+
+def _template_digest(app, name: str) -> str:
+    return file_digest(os.path.join(app.root_path, app.template_folder, name))
+
+
+def _page_digest(app, base: str, templates) -> str:
+    hasher = hashlib.sha256(base.encode('ascii'))
+    for name in sorted(templates):
+        try:
+            hasher.update(f"{name}:{_template_digest(app, name)}".encode('utf-8'))
+        except OSError:
+            # A template that no longer exists forces a rebuild
+            hasher.update(f"{name}:missing".encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def _load_manifest(path: str) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _link(source: str, destination: str) -> bool:
+    """Hard-link ``source`` to ``destination`` unless it is already there."""
+    if os.path.exists(destination):
+        if os.path.samefile(source, destination) or file_digest(destination) == file_digest(source):
+            return False
+        os.remove(destination)
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+    return True
+
+
+def sync_static(app, static_manifest: dict, destination: str) -> int:
+    """Place every static file under its own and its fingerprinted name; drop stale files."""
+    expected = set()
+    linked = 0
+    for name, entry in static_manifest.items():
+        source = os.path.join(app.static_folder, *name.split('/'))
+        for target in (name, entry['fingerprinted']):
+            path = os.path.join(destination, *target.split('/'))
+            expected.add(os.path.normpath(path))
+            linked += _link(source, path)
+
+    for dirpath, _, filenames in os.walk(destination):
+        for filename in filenames:
+            path = os.path.normpath(os.path.join(dirpath, filename))
+            if path not in expected:
+                os.remove(path)
+    return linked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--full', action='store_true', help='discard the previous build and rebuild everything')
+    args = parser.parse_args()
+
+    # The app fingerprints the static folder when it is imported, so the
+    # vendored libraries must be in place first
+    fetched, total, _ = vendor()
+    from app import app, game_store, static_manifest
+
+    if args.full and os.path.exists(BUILD_DIR):
+        shutil.rmtree(BUILD_DIR)
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    manifest_path = os.path.join(BUILD_DIR, MANIFEST_NAME)
+    previous = _load_manifest(manifest_path)
+
+    # Imported for production, the app already links fingerprinted names
+    linked = sync_static(app, static_manifest, os.path.join(BUILD_DIR, 'static'))
+
+    # Pages embed fingerprinted asset names, so they depend on the assets too
+    base = hashlib.sha256(
+        (_code_digest(app) + json.dumps(static_manifest, sort_keys=True)).encode('utf-8')
+    ).hexdigest()
+    pages = dict(previous.get('pages', {}))
+    skipped = {}
+
+    def skip(url, filename):
+        entry = pages.get(url)
+        skipped[url] = (
+            entry is not None
+            and os.path.isfile(filename)
+            and entry['digest'] == _page_digest(app, base, entry['templates'])
+        )
+        return skipped[url]
+
+    app.config['FREEZER_DESTINATION'] = os.path.abspath(BUILD_DIR)
+    app.config['FREEZER_SKIP_EXISTING'] = skip
+    # Static files and the manifest are managed here, not by the freezer
+    app.config['FREEZER_DESTINATION_IGNORE'] = [MANIFEST_NAME, 'static/*']
+    freezer = Freezer(app, with_static_files=False, log_url_for=False)
+
+    @freezer.register_generator
+    def play_game():
+        for paper_id in game_store.paper_ids():
+            for game_type in GameGenerator.GAME_INFO:
+                yield {'game_id': f"{paper_id}_{game_type}"}
+
+    @freezer.register_generator
+    def get_game():
+        yield from play_game()
+
+    rendered = []
+
+    def record_template(sender, template, context, **extra):
+        rendered.append(template.name)
+
+    built = 0
+    seen = set()
+    with template_rendered.connected_to(record_template, app):
+        for page in freezer.freeze_yield():
+            seen.add(page.url)
+            if not skipped.get(page.url):
+                pages[page.url] = {'digest': _page_digest(app, base, rendered), 'templates': sorted(set(rendered))}
+                built += 1
+            rendered.clear()
+
+    with open(manifest_path, 'w', encoding='utf-8') as file:
+        json.dump({'static': static_manifest, 'pages': {url: pages[url] for url in sorted(seen)}}, file, indent=2)
 
-# Copy static files
-shutil.copytree('static', os.path.join(build_dir, 'static'))
+    print(f"Built {built} of {len(seen)} pages; linked {linked} static files; fetched {fetched} of {total} vendored files")
 
-# Initialize Frozen-Flask
-freezer = Freezer(app)
 
-# Generate static files
-freezer.freeze()
+if __name__ == '__main__':
+    main()
@@ -231,6 +231,19 @@ progress_bar: Callable[..., Option] = partial(
     help="Specify whether the progress bar should be used [on, off, raw] (default: on)",
 )
 
+parallel_downloads: Callable[..., Option] = partial(
+    Option,
+    "--parallel-downloads",
+    dest="parallel_downloads",
+    type="int",
+    metavar="n",
+    default=1,
+    help=(
+        "Download up to <n> distributions at once, keeping within the "
+        "connections pooled for each host (default: 1)."
+    ),
+)
+
 log: Callable[..., Option] = partial(
     PipOption,
     "--log",
@@ -1009,6 +1022,7 @@ use_new_feature: Callable[..., Option] = partial(
     default=[],
     choices=[
         "fast-deps",
+        "parallel-index",
     ]
     + ALWAYS_ENABLED_FEATURES,
     help="Enable new functionality, that may be backward incompatible.",
@@ -91,15 +91,18 @@ class CacheCommand(Command):
             raise CommandError("Too many arguments")
 
         num_http_files = len(self._find_http_files(options))
+        num_links_files = len(self._find_links_files(options))
         num_packages = len(self._find_wheels(options, "*"))
 
         http_cache_location = self._cache_dir(options, "http-v2")
         old_http_cache_location = self._cache_dir(options, "http")
+        links_cache_location = self._cache_dir(options, "index-links")
         wheels_cache_location = self._cache_dir(options, "wheels")
         http_cache_size = filesystem.format_size(
             filesystem.directory_size(http_cache_location)
             + filesystem.directory_size(old_http_cache_location)
         )
+        links_cache_size = filesystem.format_directory_size(links_cache_location)
         wheels_cache_size = filesystem.format_directory_size(wheels_cache_location)
 
         message = (
@@ -109,6 +112,9 @@ class CacheCommand(Command):
                     Package index page cache location (older pips): {old_http_cache_location}
                     Package index page cache size: {http_cache_size}
                     Number of HTTP files: {num_http_files}
+                    Parsed index links cache location: {links_cache_location}
+                    Parsed index links cache size: {links_cache_size}
+                    Number of parsed index pages: {num_links_files}
                     Locally built wheels location: {wheels_cache_location}
                     Locally built wheels size: {wheels_cache_size}
                     Number of locally built wheels: {package_count}
@@ -119,6 +125,9 @@ class CacheCommand(Command):
                 old_http_cache_location=old_http_cache_location,
                 http_cache_size=http_cache_size,
                 num_http_files=num_http_files,
+                links_cache_location=links_cache_location,
+                links_cache_size=links_cache_size,
+                num_links_files=num_links_files,
                 wheels_cache_location=wheels_cache_location,
                 package_count=num_packages,
                 wheels_cache_size=wheels_cache_size,
@@ -173,6 +182,7 @@ class CacheCommand(Command):
         if args[0] == "*":
             # Only fetch http files if no specific pattern given
             files += self._find_http_files(options)
+            files += self._find_links_files(options)
         else:
             # Add the pattern to the log message
             no_matching_msg += f' for pattern "{args[0]}"'
@@ -201,6 +211,10 @@ class CacheCommand(Command):
             new_http_dir, "*"
         )
 
+    def _find_links_files(self, options: Values) -> List[str]:
+        links_dir = self._cache_dir(options, "index-links")
+        return filesystem.find_files(links_dir, "*")
+
     def _find_wheels(self, options: Values, pattern: str) -> List[str]:
         wheel_dir = self._cache_dir(options, "wheels")
 
@@ -47,6 +47,7 @@ class DownloadCommand(RequirementCommand):
         self.cmd_opts.add_option(cmdoptions.pre())
         self.cmd_opts.add_option(cmdoptions.require_hashes())
         self.cmd_opts.add_option(cmdoptions.progress_bar())
+        self.cmd_opts.add_option(cmdoptions.parallel_downloads())
         self.cmd_opts.add_option(cmdoptions.no_build_isolation())
         self.cmd_opts.add_option(cmdoptions.use_pep517())
         self.cmd_opts.add_option(cmdoptions.no_use_pep517())
@@ -117,6 +118,7 @@ class DownloadCommand(RequirementCommand):
             use_user_site=False,
             verbosity=self.verbosity,
         )
+        preparer.set_parallel_downloads(options.parallel_downloads)
 
         resolver = self.make_resolver(
             preparer=preparer,
@@ -237,6 +237,7 @@ class InstallCommand(RequirementCommand):
         self.cmd_opts.add_option(cmdoptions.prefer_binary())
         self.cmd_opts.add_option(cmdoptions.require_hashes())
         self.cmd_opts.add_option(cmdoptions.progress_bar())
+        self.cmd_opts.add_option(cmdoptions.parallel_downloads())
         self.cmd_opts.add_option(cmdoptions.root_user_action())
 
         index_opts = cmdoptions.make_option_group(
@@ -360,6 +361,7 @@ class InstallCommand(RequirementCommand):
                 use_user_site=options.use_user_site,
                 verbosity=self.verbosity,
             )
+            preparer.set_parallel_downloads(options.parallel_downloads)
             resolver = self.make_resolver(
                 preparer=preparer,
                 finder=finder,
@@ -67,6 +67,7 @@ class WheelCommand(RequirementCommand):
         self.cmd_opts.add_option(cmdoptions.ignore_requires_python())
         self.cmd_opts.add_option(cmdoptions.no_deps())
         self.cmd_opts.add_option(cmdoptions.progress_bar())
+        self.cmd_opts.add_option(cmdoptions.parallel_downloads())
 
         self.cmd_opts.add_option(
             "--no-verify",
@@ -132,6 +133,7 @@ class WheelCommand(RequirementCommand):
             use_user_site=False,
             verbosity=self.verbosity,
         )
+        preparer.set_parallel_downloads(options.parallel_downloads)
 
         resolver = self.make_resolver(
             preparer=preparer,
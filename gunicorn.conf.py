@@ -0,0 +1,59 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+A few threaded web workers serve pages, polls and progress streams, which are
+I/O-bound; paper processing runs in each web worker's job pool, which gets an
+equal share of the CPUs. The app and its models are loaded once in the master
+and inherited by every worker. Every setting can be overridden through the
+environment variable named next to it.
+"""
+
+import os
+import sys
+
+cpus = os.cpu_count() or 1
+
+bind = os.environ.get('PAPERSCAPE_BIND', '0.0.0.0:8000')
+
+# Page serving (PAPERSCAPE_WEB_WORKERS, PAPERSCAPE_WEB_THREADS): threads
+# keep long-lived SSE streams from tying up a whole worker
+workers = int(os.environ.get('PAPERSCAPE_WEB_WORKERS', min(cpus, 2)))
+worker_class = 'gthread'
+threads = int(os.environ.get('PAPERSCAPE_WEB_THREADS', 8))
+
+# Paper processing (PAPERSCAPE_JOB_WORKERS): split the CPUs between the
+# web workers' job pools rather than giving each pool every CPU
+os.environ.setdefault('PAPERSCAPE_JOB_WORKERS', str(max(1, cpus // workers)))
+
+# Load spaCy, and the summarizer when summaries are abstractive by default
+# (PAPERSCAPE_SUMMARY_MODE), in the master before forking
+# (PAPERSCAPE_PRELOAD_MODELS)
+preload_app = True
+os.environ.setdefault('PAPERSCAPE_PRELOAD_MODELS', '1')
+
+# Recycle workers to return memory leaked by the NLP libraries
+# (PAPERSCAPE_MAX_REQUESTS, PAPERSCAPE_JOB_MAX_TASKS_PER_POOL); jitter keeps
+# workers from restarting together
+max_requests = int(os.environ.get('PAPERSCAPE_MAX_REQUESTS', 1000))
+max_requests_jitter = max(1, max_requests // 10)
+os.environ.setdefault('PAPERSCAPE_JOB_MAX_TASKS_PER_POOL', '50')
+
+# Paper processing happens off the request path, so requests are short;
+# a restarting worker gets a while to let running papers finish
+timeout = int(os.environ.get('PAPERSCAPE_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('PAPERSCAPE_GRACEFUL_TIMEOUT', 300))
+
+
+def worker_exit(server, worker):
+    # Let papers already being processed by this worker's job pool finish
+    from app import job_queue
+    job_queue.shutdown(wait=True)
+
+
+def child_exit(server, worker):
+    # Fail the jobs of a worker that was killed (timeout, crash) before its
+    # pool could finish them; the app is only loaded here when preloaded
+    if 'app' in sys.modules:
+        sys.modules['app'].job_queue.sweep()
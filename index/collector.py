@@ -9,44 +9,57 @@ import itertools
 import json
 import logging
 import os
+import sys
 import urllib.parse
 import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from html.parser import HTMLParser
 from optparse import Values
 from typing import (
+    Any,
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     MutableMapping,
     NamedTuple,
     Optional,
     Protocol,
     Sequence,
+    Set,
     Tuple,
     Union,
 )
 
 from pip._vendor import requests
 from pip._vendor.requests import Response
+from pip._vendor.requests.adapters import DEFAULT_POOLSIZE
 from pip._vendor.requests.exceptions import RetryError, SSLError
 
 from pip._internal.exceptions import NetworkConnectionError
 from pip._internal.models.link import Link
 from pip._internal.models.search_scope import SearchScope
+from pip._internal.network.cache import is_from_cache
 from pip._internal.network.session import PipSession
 from pip._internal.network.utils import raise_for_status
 from pip._internal.utils.filetypes import is_archive_file
 from pip._internal.utils.misc import redact_auth_from_url
 from pip._internal.vcs import vcs
 
+from .link_cache import LinkCache
 from .sources import CandidatesFromPage, LinkSource, build_source
 
 logger = logging.getLogger(__name__)
 
 ResponseHeaders = MutableMapping[str, str]
 
+# Index pages fetched at once by --use-feature=parallel-index: no more than
+# the session's adapters keep connections open for, so every fetch can reuse
+# a pooled connection.
+PREFETCH_WORKERS = DEFAULT_POOLSIZE
+
 
 def _match_vcs_scheme(url: str) -> Optional[str]:
     """Look for VCS schemes in the URL.
@@ -196,8 +209,15 @@ class CacheablePageContent:
         return hash(self.page.url)
 
 
+# Given the absolute URL of a file listed on an index page, whether a Link is
+# worth building for it. Must not reject any URL that could yield a candidate.
+LinkFilter = Callable[[str], bool]
+
+
 class ParseLinks(Protocol):
-    def __call__(self, page: "IndexContent") -> Iterable[Link]: ...
+    def __call__(
+        self, page: "IndexContent", link_filter: Optional[LinkFilter] = None
+    ) -> Iterable[Link]: ...
 
 
 def with_cached_index_content(fn: ParseLinks) -> ParseLinks:
@@ -205,6 +225,9 @@ def with_cached_index_content(fn: ParseLinks) -> ParseLinks:
     Given a function that parses an Iterable[Link] from an IndexContent, cache the
     function's result (keyed by CacheablePageContent), unless the IndexContent
     `page` has `page.cache_link_parsing == False`.
+
+    Cached pages (find-links pages, which list files of many projects) are
+    always parsed in full, ignoring `link_filter`.
     """
 
     @functools.lru_cache(maxsize=None)
@@ -212,43 +235,94 @@ def with_cached_index_content(fn: ParseLinks) -> ParseLinks:
         return list(fn(cacheable_page.page))
 
     @functools.wraps(fn)
-    def wrapper_wrapper(page: "IndexContent") -> List[Link]:
+    def wrapper_wrapper(
+        page: "IndexContent", link_filter: Optional[LinkFilter] = None
+    ) -> List[Link]:
         if page.cache_link_parsing:
             return wrapper(CacheablePageContent(page))
-        return list(fn(page))
+        return list(fn(page, link_filter))
 
     return wrapper_wrapper
 
 
-@with_cached_index_content
-def parse_links(page: "IndexContent") -> Iterable[Link]:
+# The file entries of an index page before Links are built from them: the
+# "files" of a Simple API JSON page, or the attributes of an HTML page's
+# anchors.
+PageEntries = List[Dict[str, Any]]
+
+
+def parse_entries(page: "IndexContent") -> Tuple[str, PageEntries]:
     """
-    Parse a Simple API's Index Content, and yield its anchor elements as Link objects.
+    Parse a Simple API's Index Content into the base URL of its links and its
+    raw file entries, for links_from_entries().
     """
-
     content_type_l = page.content_type.lower()
     if content_type_l.startswith("application/vnd.pypi.simple.v1+json"):
         data = json.loads(page.content)
-        for file in data.get("files", []):
-            link = Link.from_json(file, page.url)
-            if link is None:
-                continue
-            yield link
-        return
+        return page.url, data.get("files", [])
 
     parser = HTMLLinkParser(page.url)
     encoding = page.encoding or "utf-8"
     parser.feed(page.content.decode(encoding))
+    return parser.base_url or page.url, parser.anchors
+
+
+def links_from_entries(
+    page: "IndexContent",
+    base_url: str,
+    entries: PageEntries,
+    link_filter: Optional[LinkFilter] = None,
+) -> Iterator[Link]:
+    """
+    Yield a Link for each of a page's file entries, as parse_entries() returns
+    them.
 
+    Files whose URL `link_filter` rejects are skipped before a Link is built
+    for them, which saves most of the work on pages listing many files.
+    """
     url = page.url
-    base_url = parser.base_url or url
-    for anchor in parser.anchors:
+    content_type_l = page.content_type.lower()
+    if content_type_l.startswith("application/vnd.pypi.simple.v1+json"):
+        for file in entries:
+            if link_filter is not None:
+                file_url = file.get("url")
+                if file_url is None:
+                    continue
+                if not link_filter(urllib.parse.urljoin(url, file_url)):
+                    continue
+            link = Link.from_json(file, url)
+            if link is None:
+                continue
+            yield link
+        return
+
+    for anchor in entries:
+        if link_filter is not None:
+            href = anchor.get("href")
+            if not href:
+                continue
+            if not link_filter(urllib.parse.urljoin(base_url, href)):
+                continue
         link = Link.from_element(anchor, page_url=url, base_url=base_url)
         if link is None:
             continue
         yield link
 
 
+@with_cached_index_content
+def parse_links(
+    page: "IndexContent", link_filter: Optional[LinkFilter] = None
+) -> Iterable[Link]:
+    """
+    Parse a Simple API's Index Content, and yield its anchor elements as Link objects.
+
+    Files whose URL `link_filter` rejects are skipped before a Link is built
+    for them, which saves most of the work on pages listing many files.
+    """
+    base_url, entries = parse_entries(page)
+    return links_from_entries(page, base_url, entries, link_filter)
+
+
 @dataclass(frozen=True)
 class IndexContent:
     """Represents one response (or page), along with its URL.
@@ -258,6 +332,10 @@ class IndexContent:
     :param cache_link_parsing: whether links parsed from this page's url
                                should be cached. PyPI index urls should
                                have this set to False, for example.
+    :param validator: the response's ETag or, failing that, Last-Modified
+                      header, identifying this version of the page.
+    :param from_cache: whether the HTTP cache served (and, for index pages,
+                       revalidated) the response.
     """
 
     content: bytes
@@ -265,6 +343,8 @@ class IndexContent:
     encoding: Optional[str]
     url: str
     cache_link_parsing: bool = True
+    validator: Optional[str] = None
+    from_cache: bool = False
 
     def __str__(self) -> str:
         return redact_auth_from_url(self.url)
@@ -312,12 +392,20 @@ def _make_index_content(
     response: Response, cache_link_parsing: bool = True
 ) -> IndexContent:
     encoding = _get_encoding_from_headers(response.headers)
+    if "ETag" in response.headers:
+        validator: Optional[str] = "etag:" + response.headers["ETag"]
+    elif "Last-Modified" in response.headers:
+        validator = "last-modified:" + response.headers["Last-Modified"]
+    else:
+        validator = None
     return IndexContent(
         response.content,
         response.headers["Content-Type"],
         encoding=encoding,
         url=response.url,
         cache_link_parsing=cache_link_parsing,
+        validator=validator,
+        from_cache=is_from_cache(response),
     )
 
 
@@ -399,9 +487,25 @@ class LinkCollector:
         self,
         session: PipSession,
         search_scope: SearchScope,
+        prefetch_workers: int = 0,
+        link_cache: Optional[LinkCache] = None,
     ) -> None:
+        """
+        :param prefetch_workers: How many index pages prefetch() may fetch
+            concurrently. 0 disables prefetching.
+        :param link_cache: Where to keep links parsed from index pages
+            across runs, if anywhere.
+        """
         self.search_scope = search_scope
         self.session = session
+        self.prefetch_workers = prefetch_workers
+        self.link_cache = link_cache
+
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        # Pages being prefetched, by URL, until fetch_response() takes them.
+        self._prefetched: Dict[str, "Future[Optional[IndexContent]]"] = {}
+        # Every URL ever prefetched, so a page is never fetched twice.
+        self._prefetched_urls: Set[str] = set()
 
     @classmethod
     def create(
@@ -431,9 +535,21 @@ class LinkCollector:
             index_urls=index_urls,
             no_index=options.no_index,
         )
+        if "parallel-index" in options.features_enabled:
+            prefetch_workers = PREFETCH_WORKERS
+        else:
+            prefetch_workers = 0
+        if options.cache_dir:
+            link_cache: Optional[LinkCache] = LinkCache(
+                os.path.join(options.cache_dir, "index-links")
+            )
+        else:
+            link_cache = None
         link_collector = LinkCollector(
             session=session,
             search_scope=search_scope,
+            prefetch_workers=prefetch_workers,
+            link_cache=link_cache,
         )
         return link_collector
 
@@ -445,8 +561,85 @@ class LinkCollector:
         """
         Fetch an HTML page containing package links.
         """
+        future = self._prefetched.pop(location.url, None)
+        if future is not None:
+            return future.result()
         return _get_index_content(location, session=self.session)
 
+    def parse_links(
+        self, page: IndexContent, link_filter: Optional[LinkFilter] = None
+    ) -> List[Link]:
+        """
+        Parse the links of a page, reusing the entries parsed from an earlier
+        response when the HTTP cache has confirmed the page is unchanged.
+
+        Links are only built for files `link_filter` accepts, whether the
+        page's entries come from the cache or are parsed now.
+        """
+        if self.link_cache is None or page.validator is None:
+            return parse_links(page, link_filter)
+        parsed = None
+        if page.from_cache:
+            parsed = self.link_cache.get(page)
+            if parsed is not None:
+                logger.debug("Using cached links of %s", page)
+        if parsed is None:
+            parsed = parse_entries(page)
+            self.link_cache.set(page, *parsed)
+        base_url, entries = parsed
+        return list(links_from_entries(page, base_url, entries, link_filter))
+
+    def prefetch(self, project_names: Iterable[str]) -> None:
+        """
+        Start fetching the index pages of projects that will be looked up
+        soon, so that fetch_response() finds them ready.
+
+        Pages are fetched in a bounded thread pool sharing this collector's
+        session, and with it the session's connection pools. Only HTTPS
+        index pages are prefetched; find-links locations, local indexes and
+        plain HTTP indexes (which need an origin check first) are read when
+        they are needed. Does nothing unless prefetching was enabled.
+        """
+        if not self.prefetch_workers:
+            return
+        if self._prefetch_pool is None:
+            self._prefetch_pool = ThreadPoolExecutor(
+                max_workers=self.prefetch_workers,
+                thread_name_prefix="pip-index",
+            )
+        for project_name in project_names:
+            for location in self.search_scope.get_index_urls_locations(project_name):
+                # The same link collect_sources() builds for this location.
+                link = Link(location, cache_link_parsing=False)
+                if link.url in self._prefetched_urls:
+                    continue
+                if link.scheme != "https":
+                    continue
+                self._prefetched_urls.add(link.url)
+                self._prefetched[link.url] = self._prefetch_pool.submit(
+                    _get_index_content, link, session=self.session
+                )
+
+    def close(self) -> None:
+        """
+        Stop prefetching: cancel the pages not being fetched yet and let the
+        pool's threads exit once their current page is done, without waiting
+        for them. Pages not taken yet are fetched again if needed; prefetch()
+        may be called again afterwards.
+        """
+        pool = self._prefetch_pool
+        if pool is None:
+            return
+        self._prefetch_pool = None
+        if sys.version_info >= (3, 9):
+            pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            for future in self._prefetched.values():
+                future.cancel()
+            pool.shutdown(wait=False)
+        self._prefetched_urls.difference_update(self._prefetched)
+        self._prefetched.clear()
+
     def collect_sources(
         self,
         project_name: str,
@@ -0,0 +1,98 @@
+"""Cache of links parsed from index pages, kept across runs.
+
+Parsing a large project page is a good part of the cost of looking a project
+up, and it is repeated on every run even when the HTTP cache has just
+confirmed that the page did not change. This cache keeps the file entries
+parsed out of each page (its JSON "files", or its HTML anchors), along with
+the validator (ETag or Last-Modified) of the response they were parsed from,
+so an unchanged page is never parsed twice. Links are built from the entries
+by the caller, and only for the files it is interested in.
+"""
+
+import hashlib
+import logging
+import os
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from pip._vendor import msgpack
+
+from pip import __version__
+from pip._internal.network.cache import suppressed_cache_errors
+from pip._internal.utils.filesystem import adjacent_tmp_file, replace
+from pip._internal.utils.misc import ensure_dir
+
+if TYPE_CHECKING:
+    from pip._internal.index.collector import IndexContent, PageEntries
+
+logger = logging.getLogger(__name__)
+
+# Bump when the entry layout changes. Entries are also tied to the pip
+# version, since a different pip may parse pages differently.
+_FORMAT_VERSION = 2
+
+
+class LinkCache:
+    """Parsed file entries of index pages, one file per page URL.
+
+    Each entry records the validator and content type of the response it
+    was parsed from, and is only used for a response that matches both. An
+    entry is overwritten when its page changes, so stale entries do not
+    accumulate.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def _get_cache_path(self, url: str) -> str:
+        hashed = hashlib.sha224(url.encode()).hexdigest()
+        parts = [hashed[:2], hashed[2:4], hashed[4:6], hashed[6:]]
+        return os.path.join(self.directory, *parts)
+
+    def get(self, page: "IndexContent") -> Optional[Tuple[str, "PageEntries"]]:
+        """Return the base URL and file entries parsed from an identical
+        response, if any."""
+        if page.validator is None:
+            return None
+        path = self._get_cache_path(page.url)
+        try:
+            with open(path, "rb") as f:
+                entry = msgpack.unpackb(f.read(), raw=False, use_list=True)
+            version, pip_version, content_type, validator, base_url, entries = entry
+            if (version, pip_version, content_type, validator) != (
+                _FORMAT_VERSION,
+                __version__,
+                page.content_type,
+                page.validator,
+            ):
+                return None
+            return base_url, entries
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A corrupt or unreadable entry is just a miss.
+            logger.debug("Ignoring unreadable link cache entry %s", path)
+            return None
+
+    def set(self, page: "IndexContent", base_url: str, entries: "PageEntries") -> None:
+        if page.validator is None:
+            return
+        entry = [
+            _FORMAT_VERSION,
+            __version__,
+            page.content_type,
+            page.validator,
+            base_url,
+            entries,
+        ]
+        try:
+            data = msgpack.packb(entry, use_bin_type=True)
+        except Exception:
+            # Entries hold whatever the index sent; skip any msgpack can't.
+            logger.debug("Not caching the links of %s", page)
+            return
+        path = self._get_cache_path(page.url)
+        with suppressed_cache_errors():
+            ensure_dir(os.path.dirname(path))
+            with adjacent_tmp_file(path) as f:
+                f.write(data)
+            replace(f.name, path)
@@ -4,9 +4,21 @@ import enum
 import functools
 import itertools
 import logging
+import posixpath
 import re
+import urllib.parse
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from pip._vendor.packaging import specifiers
 from pip._vendor.packaging.tags import Tag
@@ -20,7 +32,7 @@ from pip._internal.exceptions import (
     InvalidWheelFilename,
     UnsupportedWheel,
 )
-from pip._internal.index.collector import LinkCollector, parse_links
+from pip._internal.index.collector import LinkCollector
 from pip._internal.models.candidate import InstallationCandidate
 from pip._internal.models.format_control import FormatControl
 from pip._internal.models.link import Link
@@ -33,7 +45,7 @@ from pip._internal.utils._log import getLogger
 from pip._internal.utils.filetypes import WHEEL_EXTENSION
 from pip._internal.utils.hashes import Hashes
 from pip._internal.utils.logging import indent_log
-from pip._internal.utils.misc import build_netloc
+from pip._internal.utils.misc import build_netloc, splitext
 from pip._internal.utils.packaging import check_requires_python
 from pip._internal.utils.unpacking import SUPPORTED_EXTENSIONS
 
@@ -49,6 +61,21 @@ BuildTag = Union[Tuple[()], Tuple[int, str]]
 CandidateSortingKey = Tuple[int, int, int, _BaseVersion, Optional[int], BuildTag]
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_wheel_filename(filename: str) -> Wheel:
+    """
+    Parse a wheel filename, once per filename while it is in use.
+
+    The same candidate wheels are looked at by the link evaluator and the
+    candidate sort, and again for every requirement on their project. The
+    cache is bounded, so the wheels of pages looked at long ago do not stay
+    alive for the whole run.
+
+    :raises InvalidWheelFilename: if the filename is not a valid wheel's.
+    """
+    return Wheel(filename)
+
+
 def _check_link_requires_python(
     link: Link,
     version_info: Tuple[int, int, int],
@@ -154,6 +181,39 @@ class LinkEvaluator:
 
         self.project_name = project_name
 
+    def may_be_candidate(self, url: str) -> bool:
+        """
+        Cheaply rule out a file from its URL alone, before a Link is built.
+
+        This returns False only for URLs whose file name evaluate_link()
+        would reject: unsupported archive formats, disallowed formats, and
+        wheels that are invalid, for another project or incompatible. It
+        returns True for everything else, including links with an egg
+        fragment, which evaluate_link() judges by the fragment instead.
+        """
+        if "egg=" in url:
+            return True
+        # The same file name and extension Link.filename and Link.splitext()
+        # would give.
+        path = urllib.parse.unquote(urllib.parse.urlsplit(url).path)
+        name = posixpath.basename(path.rstrip("/"))
+        ext = splitext(name)[1]
+        if ext not in SUPPORTED_EXTENSIONS:
+            return False
+        if ext != WHEEL_EXTENSION:
+            return "source" in self._formats
+        if "binary" not in self._formats:
+            return False
+        try:
+            # Most of a page's wheels are rejected here and never looked at
+            # again, so they are not worth caching.
+            wheel = Wheel(urllib.parse.unquote(name))
+        except InvalidWheelFilename:
+            return False
+        if canonicalize_name(wheel.name) != self._canonical_name:
+            return False
+        return wheel.supported(self._target_python.get_unsorted_tags())
+
     def evaluate_link(self, link: Link) -> Tuple[LinkType, str]:
         """
         Determine whether a link is a candidate for installation.
@@ -188,7 +248,7 @@ class LinkEvaluator:
                 return (LinkType.format_unsupported, "macosx10 one")
             if ext == WHEEL_EXTENSION:
                 try:
-                    wheel = Wheel(link.filename)
+                    wheel = _parse_wheel_filename(link.filename)
                 except InvalidWheelFilename:
                     return (
                         LinkType.format_invalid,
@@ -410,6 +470,7 @@ class CandidateEvaluator:
         return cls(
             project_name=project_name,
             supported_tags=supported_tags,
+            tag_priorities=target_python.get_tag_priorities(),
             specifier=specifier,
             prefer_binary=prefer_binary,
             allow_all_prereleases=allow_all_prereleases,
@@ -424,10 +485,14 @@ class CandidateEvaluator:
         prefer_binary: bool = False,
         allow_all_prereleases: bool = False,
         hashes: Optional[Hashes] = None,
+        tag_priorities: Optional[Dict[Tag, int]] = None,
     ) -> None:
         """
         :param supported_tags: The PEP 425 tags supported by the target
             Python in order of preference (most preferred first).
+        :param tag_priorities: A map from each of supported_tags to its index
+            in that list, if one was already built (see
+            TargetPython.get_tag_priorities()).
         """
         self._allow_all_prereleases = allow_all_prereleases
         self._hashes = hashes
@@ -438,9 +503,9 @@ class CandidateEvaluator:
         # Since the index of the tag in the _supported_tags list is used
         # as a priority, precompute a map from tag to index/priority to be
         # used in wheel.find_most_preferred_tag.
-        self._wheel_tag_preferences = {
-            tag: idx for idx, tag in enumerate(supported_tags)
-        }
+        if tag_priorities is None:
+            tag_priorities = {tag: idx for idx, tag in enumerate(supported_tags)}
+        self._wheel_tag_preferences = tag_priorities
 
     def get_applicable_candidates(
         self,
@@ -514,7 +579,7 @@ class CandidateEvaluator:
         link = candidate.link
         if link.is_wheel:
             # can raise InvalidWheelFilename
-            wheel = Wheel(link.filename)
+            wheel = _parse_wheel_filename(link.filename)
             try:
                 pri = -(
                     wheel.find_most_preferred_tag(
@@ -785,7 +850,9 @@ class PackageFinder:
         if index_response is None:
             return []
 
-        page_links = list(parse_links(index_response))
+        page_links = self._link_collector.parse_links(
+            index_response, link_filter=link_evaluator.may_be_candidate
+        )
 
         with indent_log():
             package_links = self.evaluate_links(
@@ -795,6 +862,19 @@ class PackageFinder:
 
         return package_links
 
+    def prefetch_candidates(self, project_names: Iterable[str]) -> None:
+        """Start fetching the index pages of projects whose candidates will
+        be needed soon, if the link collector prefetches.
+
+        find_all_candidates() then uses the prefetched pages, processing
+        them in the same order as always, so results do not change.
+        """
+        self._link_collector.prefetch(project_names)
+
+    def stop_prefetching(self) -> None:
+        """Cancel the index pages still waiting to be prefetched."""
+        self._link_collector.close()
+
     @functools.lru_cache(maxsize=None)
     def find_all_candidates(self, project_name: str) -> List[InstallationCandidate]:
         """Find all available InstallationCandidate for project_name
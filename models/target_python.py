@@ -1,5 +1,5 @@
 import sys
-from typing import List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from pip._vendor.packaging.tags import Tag
 
@@ -22,6 +22,7 @@ class TargetPython:
         "py_version_info",
         "_valid_tags",
         "_valid_tags_set",
+        "_tag_priorities",
     ]
 
     def __init__(
@@ -64,6 +65,7 @@ class TargetPython:
         # This is used to cache the return value of get_(un)sorted_tags.
         self._valid_tags: Optional[List[Tag]] = None
         self._valid_tags_set: Optional[Set[Tag]] = None
+        self._tag_priorities: Optional[Dict[Tag, int]] = None
 
     def format_given(self) -> str:
         """
@@ -119,3 +121,16 @@ class TargetPython:
             self._valid_tags_set = set(self.get_sorted_tags())
 
         return self._valid_tags_set
+
+    def get_tag_priorities(self) -> Dict[Tag, int]:
+        """Map each tag of get_sorted_tags to its index, lower being more
+        preferred.
+
+        Every CandidateEvaluator sorts with this, so it is built only once.
+        """
+        if self._tag_priorities is None:
+            self._tag_priorities = {
+                tag: idx for idx, tag in enumerate(self.get_sorted_tags())
+            }
+
+        return self._tag_priorities
@@ -9,6 +9,7 @@ import os
 import shutil
 import subprocess
 import sysconfig
+import threading
 import typing
 import urllib.parse
 from abc import ABC, abstractmethod
@@ -17,7 +18,7 @@ from os.path import commonprefix
 from pathlib import Path
 from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
-from pip._vendor.requests.auth import AuthBase, HTTPBasicAuth
+from pip._vendor.requests.auth import AuthBase, HTTPBasicAuth, _basic_auth_str
 from pip._vendor.requests.models import Request, Response
 from pip._vendor.requests.utils import get_netrc_auth
 
@@ -234,10 +235,13 @@ class MultiDomainBasicAuth(AuthBase):
         self.passwords: Dict[str, AuthInfo] = {}
         # When the user is prompted to enter credentials and keyring is
         # available, we will offer to save them. If the user accepts,
-        # this value is set to the credentials they entered. After the
+        # the credentials they entered are kept here, by netloc. After the
         # request authenticates, the caller should call
         # ``save_credentials`` to save these.
-        self._credentials_to_save: Optional[Credentials] = None
+        self._credentials_to_save: Dict[str, Credentials] = {}
+        # Index pages may be fetched from several threads at once (see
+        # LinkCollector.prefetch()); only one of them prompts at a time.
+        self._prompt_lock = threading.Lock()
 
     @property
     def keyring_provider(self) -> KeyRingBaseProvider:
@@ -499,23 +503,36 @@ class MultiDomainBasicAuth(AuthBase):
 
         parsed = urllib.parse.urlparse(resp.url)
 
-        # Prompt the user for a new username and password
-        save = False
-        if not username and not password:
-            username, password, save = self._prompt_for_password(parsed.netloc)
+        with self._prompt_lock:
+            # Another thread may have prompted for this host while we waited
+            stored = self.passwords.get(parsed.netloc)
+            sent = resp.request.headers.get("Authorization")
+            if (
+                not username
+                and not password
+                and stored is not None
+                and _basic_auth_str(*stored) != sent
+            ):
+                username, password = stored
+
+            # Prompt the user for a new username and password
+            save = False
+            if not username and not password:
+                username, password, save = self._prompt_for_password(parsed.netloc)
+
+            # Store the new username and password to use for future requests
+            to_save = None
+            if username is not None and password is not None:
+                self.passwords[parsed.netloc] = (username, password)
 
-        # Store the new username and password to use for future requests
-        self._credentials_to_save = None
-        if username is not None and password is not None:
-            self.passwords[parsed.netloc] = (username, password)
-
-            # Prompt to save the password to keyring
-            if save and self._should_save_password_to_keyring():
-                self._credentials_to_save = Credentials(
-                    url=parsed.netloc,
-                    username=username,
-                    password=password,
-                )
+                # Prompt to save the password to keyring
+                if save and self._should_save_password_to_keyring():
+                    to_save = Credentials(
+                        url=parsed.netloc,
+                        username=username,
+                        password=password,
+                    )
+                    self._credentials_to_save[parsed.netloc] = to_save
 
         # Consume content and release the original connection to allow our new
         #   request to reuse the same one.
@@ -531,7 +548,7 @@ class MultiDomainBasicAuth(AuthBase):
         # On successful request, save the credentials that were used to
         # keyring. (Note that if the user responded "no" above, this member
         # is not set and nothing will be saved.)
-        if self._credentials_to_save:
+        if to_save is not None:
             req.register_hook("response", self.save_credentials)
 
         # Send our new request
@@ -554,8 +571,8 @@ class MultiDomainBasicAuth(AuthBase):
             self.keyring_provider.has_keyring
         ), "should never reach here without keyring"
 
-        creds = self._credentials_to_save
-        self._credentials_to_save = None
+        netloc = urllib.parse.urlparse(resp.url).netloc
+        creds = self._credentials_to_save.pop(netloc, None)
         if creds and resp.status_code < 400:
             try:
                 logger.info("Saving credentials to keyring")
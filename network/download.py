@@ -5,17 +5,30 @@ import email.message
 import logging
 import mimetypes
 import os
-from typing import Iterable, Optional, Tuple
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from pip._vendor.requests.adapters import DEFAULT_POOLSIZE
 from pip._vendor.requests.models import Response
+from pip._vendor.rich.progress import (
+    BarColumn,
+    DownloadColumn,
+    Progress,
+    TextColumn,
+    TimeRemainingColumn,
+    TransferSpeedColumn,
+)
 
 from pip._internal.cli.progress_bars import get_download_progress_renderer
-from pip._internal.exceptions import NetworkConnectionError
+from pip._internal.exceptions import HashError, NetworkConnectionError
 from pip._internal.models.index import PyPI
 from pip._internal.models.link import Link
 from pip._internal.network.cache import is_from_cache
 from pip._internal.network.session import PipSession
 from pip._internal.network.utils import HEADERS, raise_for_status, response_chunks
+from pip._internal.utils.hashes import Hashes
+from pip._internal.utils.logging import get_indentation, indent_log
 from pip._internal.utils.misc import format_size, redact_auth_from_url, splitext
 
 logger = logging.getLogger(__name__)
@@ -28,11 +41,8 @@ def _get_http_response_size(resp: Response) -> Optional[int]:
         return None
 
 
-def _prepare_download(
-    resp: Response,
-    link: Link,
-    progress_bar: str,
-) -> Iterable[bytes]:
+def _describe_download(resp: Response, link: Link) -> Tuple[str, Optional[int]]:
+    """Say which file is being downloaded; return that and its size, if known."""
     total_length = _get_http_response_size(resp)
 
     if link.netloc == PyPI.file_storage_domain:
@@ -46,9 +56,23 @@ def _prepare_download(
         logged_url = f"{logged_url} ({format_size(total_length)})"
 
     if is_from_cache(resp):
-        logger.info("Using cached %s", logged_url)
-    else:
-        logger.info("Downloading %s", logged_url)
+        return f"Using cached {logged_url}", total_length
+    return f"Downloading {logged_url}", total_length
+
+
+def _log_download(resp: Response, link: Link) -> Optional[int]:
+    """Log which file is being downloaded; return its size, if known."""
+    message, total_length = _describe_download(resp, link)
+    logger.info("%s", message)
+    return total_length
+
+
+def _prepare_download(
+    resp: Response,
+    link: Link,
+    progress_bar: str,
+) -> Iterable[bytes]:
+    total_length = _log_download(resp, link)
 
     if logger.getEffectiveLevel() > logging.INFO:
         show_progress = False
@@ -120,6 +144,41 @@ def _http_get_download(session: PipSession, link: Link) -> Response:
     return resp
 
 
+def _get_download_response(session: PipSession, link: Link) -> Response:
+    try:
+        return _http_get_download(session, link)
+    except NetworkConnectionError as e:
+        assert e.response is not None
+        logger.critical("HTTP error %s while getting %s", e.response.status_code, link)
+        raise
+
+
+def _write_download(
+    chunks: Iterable[bytes], filepath: str, hashes: Optional[Hashes]
+) -> None:
+    """Write chunks to filepath, checking them against hashes on the way.
+
+    A file that fails the check is removed before HashMismatch propagates.
+    """
+    with open(filepath, "wb") as content_file:
+        if not hashes:
+            for chunk in chunks:
+                content_file.write(chunk)
+            return
+
+        def written() -> Iterator[bytes]:
+            for chunk in chunks:
+                content_file.write(chunk)
+                yield chunk
+
+        try:
+            hashes.check_against_chunks(written())
+        except HashError:
+            content_file.close()
+            os.unlink(filepath)
+            raise
+
+
 class Downloader:
     def __init__(
         self,
@@ -131,14 +190,7 @@ class Downloader:
 
     def __call__(self, link: Link, location: str) -> Tuple[str, str]:
         """Download the file given by link into location."""
-        try:
-            resp = _http_get_download(self._session, link)
-        except NetworkConnectionError as e:
-            assert e.response is not None
-            logger.critical(
-                "HTTP error %s while getting %s", e.response.status_code, link
-            )
-            raise
+        resp = _get_download_response(self._session, link)
 
         filename = _get_http_response_filename(resp, link)
         filepath = os.path.join(location, filename)
@@ -156,32 +208,136 @@ class BatchDownloader:
         self,
         session: PipSession,
         progress_bar: str,
+        parallel_downloads: int = 1,
+        max_per_host: int = DEFAULT_POOLSIZE,
     ) -> None:
+        """
+        :param parallel_downloads: How many files to download at once.
+        :param max_per_host: How many of those may come from the same host.
+            Defaults to requests' DEFAULT_POOLSIZE, the number of connections
+            the session's adapters pool per host, so that every download
+            reuses a connection.
+        """
         self._session = session
         self._progress_bar = progress_bar
+        self._parallel_downloads = max(1, parallel_downloads)
+        self._max_per_host = max(1, max_per_host)
 
     def __call__(
-        self, links: Iterable[Link], location: str
+        self,
+        links: Iterable[Link],
+        location: str,
+        hashes: Optional[Dict[Link, Hashes]] = None,
     ) -> Iterable[Tuple[Link, Tuple[str, str]]]:
-        """Download the files given by links into location."""
-        for link in links:
-            try:
-                resp = _http_get_download(self._session, link)
-            except NetworkConnectionError as e:
-                assert e.response is not None
-                logger.critical(
-                    "HTTP error %s while getting %s",
-                    e.response.status_code,
-                    link,
-                )
-                raise
-
-            filename = _get_http_response_filename(resp, link)
-            filepath = os.path.join(location, filename)
-
-            chunks = _prepare_download(resp, link, self._progress_bar)
-            with open(filepath, "wb") as content_file:
-                for chunk in chunks:
-                    content_file.write(chunk)
-            content_type = resp.headers.get("Content-Type", "")
-            yield link, (filepath, content_type)
+        """Download the files given by links into location.
+
+        Files are checked against their entry in hashes, if any, while they
+        are written. Results are produced in the order of links.
+        """
+        links = list(links)
+        hashes = hashes or {}
+        # Raw progress reports one file at a time, so it downloads serially.
+        if (
+            self._parallel_downloads == 1
+            or len(links) < 2
+            or self._progress_bar == "raw"
+        ):
+            for link in links:
+                yield link, self._download_one(link, location, hashes.get(link))
+            return
+        yield from self._download_concurrently(links, location, hashes)
+
+    def _download_one(
+        self, link: Link, location: str, hashes: Optional[Hashes]
+    ) -> Tuple[str, str]:
+        resp = _get_download_response(self._session, link)
+
+        filename = _get_http_response_filename(resp, link)
+        filepath = os.path.join(location, filename)
+
+        chunks = _prepare_download(resp, link, self._progress_bar)
+        _write_download(chunks, filepath, hashes)
+        content_type = resp.headers.get("Content-Type", "")
+        return filepath, content_type
+
+    def _download_concurrently(
+        self,
+        links: List[Link],
+        location: str,
+        hashes: Dict[Link, Hashes],
+    ) -> Iterable[Tuple[Link, Tuple[str, str]]]:
+        host_slots = {
+            link.netloc: threading.BoundedSemaphore(self._max_per_host)
+            for link in links
+        }
+        # Worker threads start with no log indentation of their own.
+        indentation = get_indentation()
+
+        show_progress = (
+            self._progress_bar == "on"
+            and logger.getEffectiveLevel() <= logging.INFO
+        )
+        progress = Progress(
+            TextColumn("{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TextColumn("eta"),
+            TimeRemainingColumn(),
+            disable=not show_progress,
+            refresh_per_second=5,
+        )
+        # One bar for the whole batch: its total grows as each response
+        # reports its size.
+        task = progress.add_task(
+            " " * (indentation + 2) + f"Downloading {len(links)} files", total=0
+        )
+        total_lock = threading.Lock()
+        total = 0
+
+        def download(link: Link) -> Tuple[str, str]:
+            nonlocal total
+            with host_slots[link.netloc], indent_log(indentation):
+                resp = _get_download_response(self._session, link)
+                filename = _get_http_response_filename(resp, link)
+                filepath = os.path.join(location, filename)
+
+                if show_progress:
+                    # pip's log handler writes to a console of its own, which
+                    # would cut across the live bar; print above it instead.
+                    message, size = _describe_download(resp, link)
+                    progress.console.print(
+                        " " * get_indentation() + message,
+                        markup=False,
+                        highlight=False,
+                    )
+                else:
+                    size = _log_download(resp, link)
+                if size:
+                    with total_lock:
+                        total += size
+                        progress.update(task, total=total)
+
+                def chunks() -> Iterator[bytes]:
+                    for chunk in response_chunks(resp):
+                        progress.advance(task, len(chunk))
+                        yield chunk
+
+                _write_download(chunks(), filepath, hashes.get(link))
+                return filepath, resp.headers.get("Content-Type", "")
+
+        pool = ThreadPoolExecutor(
+            max_workers=self._parallel_downloads, thread_name_prefix="pip-download"
+        )
+        futures: List[Future[Tuple[str, str]]] = []
+        try:
+            with progress:
+                futures = [pool.submit(download, link) for link in links]
+                for link, future in zip(links, futures):
+                    yield link, future.result()
+        finally:
+            # Stop anything not started yet if a download failed or the
+            # caller stopped early.
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
@@ -9,7 +9,7 @@ import os
 import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 
 from pip._vendor.packaging.utils import canonicalize_name
 
@@ -231,6 +231,7 @@ class RequirementPreparer:
         lazy_wheel: bool,
         verbosity: int,
         legacy_resolver: bool,
+        parallel_downloads: int = 1,
     ) -> None:
         super().__init__()
 
@@ -238,8 +239,11 @@ class RequirementPreparer:
         self.build_dir = build_dir
         self.build_tracker = build_tracker
         self._session = session
+        self._progress_bar = progress_bar
         self._download = Downloader(session, progress_bar)
-        self._batch_download = BatchDownloader(session, progress_bar)
+        self._batch_download = BatchDownloader(
+            session, progress_bar, parallel_downloads=parallel_downloads
+        )
         self.finder = finder
 
         # Where still-packed archives should be written to. If None, they are
@@ -269,10 +273,22 @@ class RequirementPreparer:
 
         # Memoized downloaded files, as mapping of url: path.
         self._downloaded: Dict[str, str] = {}
+        # URLs of downloaded files whose hashes were checked while streaming.
+        self._hash_checked: Set[str] = set()
 
         # Previous "header" printed for a link-based InstallRequirement
         self._previous_requirement_header = ("", "")
 
+    def set_parallel_downloads(self, parallel_downloads: int) -> None:
+        """Download up to ``parallel_downloads`` distributions at once.
+
+        Commands call this with --parallel-downloads once the preparer is
+        built, as the shared preparer factory does not know the option.
+        """
+        self._batch_download = BatchDownloader(
+            self._session, self._progress_bar, parallel_downloads=parallel_downloads
+        )
+
     def _log_preparing_link(self, req: InstallRequirement) -> None:
         """Provide context for the requirement being prepared."""
         if req.link.is_file and not req.is_wheel_from_cache:
@@ -458,13 +474,18 @@ class RequirementPreparer:
         # `req.local_file_path` on the appropriate requirement after passing
         # all the links at once into BatchDownloader.
         links_to_fully_download: Dict[Link, InstallRequirement] = {}
+        link_hashes: Dict[Link, Hashes] = {}
         for req in partially_downloaded_reqs:
             assert req.link
             links_to_fully_download[req.link] = req
+            hashes = self._get_linked_req_hashes(req)
+            if hashes:
+                link_hashes[req.link] = hashes
 
         batch_download = self._batch_download(
             links_to_fully_download.keys(),
             temp_dir,
+            hashes=link_hashes,
         )
         for link, (filepath, _) in batch_download:
             logger.debug("Downloading link %s to %s", link, filepath)
@@ -475,6 +496,8 @@ class RequirementPreparer:
             # Record that the file is downloaded so we don't do it again in
             # _prepare_linked_requirement().
             self._downloaded[req.link.url] = filepath
+            if req.link in link_hashes:
+                self._hash_checked.add(req.link.url)
 
             # If this is an sdist, we need to unpack it after downloading, but the
             # .source_dir won't be set up until we are in _prepare_linked_requirement().
@@ -610,7 +633,7 @@ class RequirementPreparer:
                 )
         else:
             file_path = self._downloaded[link.url]
-            if hashes:
+            if hashes and link.url not in self._hash_checked:
                 hashes.check_against_path(file_path)
             local_file = File(file_path, content_type=None)
 
@@ -248,6 +248,20 @@ class Factory:
                     return None
             return self._link_candidate_cache[link]
 
+    def prefetch_candidates(self, requirements: Iterable[Requirement]) -> None:
+        """Let the finder fetch index pages for requirements about to be
+        resolved, ahead of the resolver asking for their candidates.
+        """
+        self._finder.prefetch_candidates(
+            req.project_name
+            for req in requirements
+            # Only these are looked up on the index.
+            if req.get_candidate_lookup()[1] is not None
+        )
+
+    def stop_prefetching(self) -> None:
+        self._finder.stop_prefetching()
+
     def _iter_found_candidates(
         self,
         ireqs: Sequence[InstallRequirement],
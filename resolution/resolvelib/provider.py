@@ -244,7 +244,12 @@ class PipProvider(_ProviderBase):
 
     def get_dependencies(self, candidate: Candidate) -> Sequence[Requirement]:
         with_requires = not self._ignore_dependencies
-        return [r for r in candidate.iter_dependencies(with_requires) if r is not None]
+        dependencies = [
+            r for r in candidate.iter_dependencies(with_requires) if r is not None
+        ]
+        # The resolver will look these up next.
+        self._factory.prefetch_candidates(dependencies)
+        return dependencies
 
     @staticmethod
     def is_backtrack_cause(
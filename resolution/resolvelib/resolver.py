@@ -74,6 +74,7 @@ class Resolver(BaseResolver):
         self, root_reqs: List[InstallRequirement], check_supported_wheels: bool
     ) -> RequirementSet:
         collected = self.factory.collect_root_requirements(root_reqs)
+        self.factory.prefetch_candidates(collected.requirements)
         provider = PipProvider(
             factory=self.factory,
             constraints=collected.constraints,
@@ -103,6 +104,11 @@ class Resolver(BaseResolver):
             )
             raise error from e
 
+        finally:
+            # Don't keep fetching pages nothing will look at, nor make pip
+            # wait for them on exit.
+            self.factory.stop_prefetching()
+
         req_set = RequirementSet(check_supported_wheels=check_supported_wheels)
         # process candidates with extras last to ensure their base equivalent is
         # already in the req_set if appropriate.
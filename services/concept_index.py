@@ -0,0 +1,60 @@
+"""
+Inverted keyword index over a paper's concepts.
+Built once per paper, it finds every pair of concepts that share a keyword by
+walking the posting list of each keyword instead of comparing all pairs.
+Keywords found in many concepts ("method", "model") relate nearly everything
+to everything and make that walk quadratic again; callers may have them left
+out like stop words with ``max_keyword_df``.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+Edge = Tuple[int, int, List[str]]
+
+class KeywordIndex:
+    def __init__(self, concepts: List[Dict], max_keyword_df: Optional[int] = None):
+        # keyword -> indices of the concepts mentioning it, in ascending order
+        self.postings: Dict[str, List[int]] = {}
+        for index, concept in enumerate(concepts):
+            for keyword in dict.fromkeys(concept['keywords']):
+                self.postings.setdefault(keyword, []).append(index)
+
+        # Bounds the pairs walked to max_keyword_df per keyword mention;
+        # None walks every keyword
+        self.max_keyword_df = max_keyword_df
+
+    def edges(self, max_edges_per_concept: Optional[int] = None) -> List[Edge]:
+        """Return (i, j, shared_keywords) for every related pair with i < j.
+
+        Keywords in more than ``max_keyword_df`` concepts, if set, neither
+        relate concepts nor count as shared. With ``max_edges_per_concept``
+        only each concept's heaviest edges (by number of shared keywords) are
+        kept; an edge survives if it is among the top edges of either
+        endpoint.
+        """
+        shared: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+        for keyword, indices in self.postings.items():
+            if self.max_keyword_df is not None and len(indices) > self.max_keyword_df:
+                continue
+            for position, i in enumerate(indices):
+                for j in indices[position + 1:]:
+                    shared[(i, j)].append(keyword)
+
+        pairs = sorted(shared)
+        if max_edges_per_concept is not None:
+            pairs = self._prune(pairs, shared, max_edges_per_concept)
+        return [(i, j, shared[(i, j)]) for i, j in pairs]
+
+    def _prune(self, pairs, shared, limit: int) -> List[Tuple[int, int]]:
+        by_concept: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for pair in pairs:
+            by_concept[pair[0]].append(pair)
+            by_concept[pair[1]].append(pair)
+
+        keep = set()
+        for concept_pairs in by_concept.values():
+            # Ties go to the earliest pair so pruning is deterministic
+            keep.update(heapq.nsmallest(limit, concept_pairs, key=lambda p: (-len(shared[p]), p)))
+        return [pair for pair in pairs if pair in keep]
@@ -0,0 +1,86 @@
+"""
+Concept classification and ranking for parsed papers.
+Sentences are classified by cue words through a sparse sentence-by-cue
+matrix and scored by how central their keywords are to the paper under
+TF-IDF, so only the strongest few concepts of each type reach the games.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+# Concept types in the order they are reported for a sentence, with the
+# (lower-cased) words that mark a sentence as one
+CONCEPT_CUES = {
+    'definition': ('is', 'are', 'refers', 'defines'),
+    'methodology': ('method', 'approach', 'technique', 'algorithm'),
+    'result': ('result', 'conclusion', 'finding', 'shows')
+}
+
+DEFAULT_MAX_PER_TYPE = 20
+
+
+def _tokens(tokens: List[str]) -> List[str]:
+    # Sentences arrive already tokenized by spaCy
+    return tokens
+
+
+def classify_sentences(sentences: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """Return a boolean mask over the sentences for each concept type."""
+    vocabulary = sorted({cue for cues in CONCEPT_CUES.values() for cue in cues})
+    vectorizer = CountVectorizer(analyzer=_tokens, vocabulary=vocabulary, binary=True)
+    matches = vectorizer.transform([sentence['words'] for sentence in sentences]).tocsc()
+
+    masks = {}
+    for concept_type, cues in CONCEPT_CUES.items():
+        columns = [vectorizer.vocabulary_[cue] for cue in cues]
+        masks[concept_type] = matches[:, columns].getnnz(axis=1) > 0
+    return masks
+
+
+def score_sentences(sentences: Sequence[Dict]) -> np.ndarray:
+    """Score sentences by the TF-IDF similarity of their keywords to the whole paper."""
+    keywords = [[keyword.lower() for keyword in sentence['keywords']] for sentence in sentences]
+    try:
+        matrix = TfidfVectorizer(analyzer=_tokens).fit_transform(keywords)
+    except ValueError:
+        # No sentence has any keywords
+        return np.zeros(len(sentences), dtype=np.float64)
+
+    centroid = np.asarray(matrix.mean(axis=0)).ravel()
+    return matrix @ centroid
+
+
+def rank_concepts(sentences: Sequence[Dict], max_per_type: Optional[int] = DEFAULT_MAX_PER_TYPE) -> List[Dict]:
+    """Classify sentences into concepts and keep the top ``max_per_type`` of each type.
+
+    Concepts are returned in document order, with a sentence that matches
+    several types listed once per type as before. ``None`` keeps every
+    matching sentence.
+    """
+    if not sentences:
+        return []
+
+    masks = classify_sentences(sentences)
+    keep = np.zeros((len(sentences), len(CONCEPT_CUES)), dtype=bool)
+    scores = score_sentences(sentences) if max_per_type is not None else None
+
+    for column, mask in enumerate(masks.values()):
+        candidates = np.flatnonzero(mask)
+        if scores is not None and len(candidates) > max_per_type:
+            # Stable sort so ties go to the earlier sentence
+            order = np.argsort(-scores[candidates], kind='stable')
+            candidates = candidates[order[:max_per_type]]
+        keep[candidates, column] = True
+
+    concept_types = list(CONCEPT_CUES)
+    concepts = []
+    for row, column in zip(*np.nonzero(keep)):
+        sentence = sentences[row]
+        concepts.append({
+            'type': concept_types[column],
+            'content': sentence['text'],
+            'keywords': sentence['keywords']
+        })
+    return concepts
@@ -0,0 +1,106 @@
+"""
+Single-pass document analysis for research papers.
+Parses the text once with spaCy, section by section, and records the
+lightweight per-sentence data that the key-phrase, entity and concept
+extractors need, so no Doc for the whole paper is ever held in memory.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List
+
+# Components the extractors never read from (we use token text, POS tags,
+# sentence boundaries, noun chunks and entities)
+UNUSED_PIPES = ('lemmatizer',)
+
+KEY_ENTITY_LABELS = {'ORG', 'PRODUCT', 'WORK_OF_ART', 'LAW', 'LANGUAGE'}
+
+# Upper bound on the text handed to spaCy in one call; roughly a section
+MAX_SECTION_CHARS = 20000
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def _split_oversized(paragraph: str, max_chars: int) -> Iterator[str]:
+    """Split a paragraph longer than max_chars, preferring sentence ends."""
+    current = ''
+    for piece in _SENTENCE_END.split(paragraph):
+        while len(piece) > max_chars:
+            if current:
+                yield current
+                current = ''
+            yield piece[:max_chars]
+            piece = piece[max_chars:]
+        if current and len(current) + len(piece) + 1 > max_chars:
+            yield current
+            current = ''
+        current = f"{current} {piece}" if current else piece
+    if current:
+        yield current
+
+
+def iter_sections(texts: Iterable[str], max_chars: int = MAX_SECTION_CHARS) -> Iterator[str]:
+    """Regroup a stream of texts into paragraph-aligned chunks of bounded size."""
+    buffer: List[str] = []
+    size = 0
+    for text in texts:
+        for paragraph in _PARAGRAPH_BREAK.split(text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if len(paragraph) > max_chars:
+                if buffer:
+                    yield '\n\n'.join(buffer)
+                    buffer, size = [], 0
+                yield from _split_oversized(paragraph, max_chars)
+                continue
+            if buffer and size + len(paragraph) > max_chars:
+                yield '\n\n'.join(buffer)
+                buffer, size = [], 0
+            buffer.append(paragraph)
+            size += len(paragraph) + 2
+    if buffer:
+        yield '\n\n'.join(buffer)
+
+
+def analyze_document(nlp, texts: Iterable[str], batch_size: int = 1) -> Dict:
+    """Parse the document once and collect sentences, key phrases and entities.
+
+    ``texts`` may be the whole paper as a single string in a list or any
+    iterable of pages; it is consumed lazily. Sections are already large, so
+    the default batch size of one lets parsing start as soon as the first
+    section has been extracted.
+    """
+    sentences = []
+    sections = 0
+    key_phrases = set()
+    entities = []
+
+    disabled = [name for name in UNUSED_PIPES if name in nlp.pipe_names]
+    with nlp.select_pipes(disable=disabled):
+        for section, doc in enumerate(nlp.pipe(iter_sections(texts), batch_size=batch_size)):
+            sections += 1
+            for sent in doc.sents:
+                sentences.append({
+                    'text': sent.text,
+                    'section': section,
+                    'words': [token.text.lower() for token in sent],
+                    'keywords': [token.text for token in sent if token.pos_ in ['NOUN', 'PROPN']]
+                })
+
+                # Noun phrases of two or more words
+                for chunk in sent.noun_chunks:
+                    if len(chunk.text.split()) >= 2:
+                        key_phrases.add(chunk.text)
+
+            for ent in doc.ents:
+                entities.append({'text': ent.text, 'label': ent.label_})
+                if ent.label_ in KEY_ENTITY_LABELS:
+                    key_phrases.add(ent.text)
+
+    return {
+        'sentences': sentences,
+        'sections': sections,
+        'key_phrases': list(key_phrases),
+        'entities': entities
+    }
@@ -1,8 +1,29 @@
 import random
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from services.instrumentation import instrumentation
+from services.graph_layout import layout_boxes
 
 class GameGenerator:
+    # Title and description of each game type, known before generation
+    GAME_INFO = {
+        'quiz': {
+            'title': 'Research Paper Quiz Challenge',
+            'description': 'Test your understanding of the research paper concepts'
+        },
+        'simulation': {
+            'title': 'Concept Interaction Simulator',
+            'description': 'Explore how different concepts interact with each other'
+        },
+        'puzzle': {
+            'title': 'Concept Connection Challenge',
+            'description': 'Connect related concepts to build a knowledge map'
+        }
+    }
+
     def __init__(self, paper_data: Dict[str, Any]):
         self.paper_data = paper_data
         self.games = {
@@ -16,7 +37,8 @@ class GameGenerator:
         if game_type not in self.games:
             raise ValueError(f"Unknown game type: {game_type}")
         
-        return self.games[game_type]()
+        with instrumentation.stage(f"game_{game_type}", len(self.paper_data.get('concepts', []))):
+            return self.games[game_type]()
 
     def _create_quiz_game(self) -> Dict[str, Any]:
         """Create an interactive quiz game"""
@@ -24,8 +46,7 @@ class GameGenerator:
         
         game_data = {
             'type': 'quiz',
-            'title': 'Research Paper Quiz Challenge',
-            'description': 'Test your understanding of the research paper concepts',
+            **self.GAME_INFO['quiz'],
             'questions': self._prepare_quiz_questions(questions),
             'settings': {
                 'time_limit': 300,  # 5 minutes
@@ -71,8 +92,7 @@ class GameGenerator:
         
         game_data = {
             'type': 'simulation',
-            'title': 'Concept Interaction Simulator',
-            'description': 'Explore how different concepts interact with each other',
+            **self.GAME_INFO['simulation'],
             'simulation_type': simulation_data['type'],
             'elements': self._prepare_simulation_elements(simulation_data['elements']),
             'interactions': simulation_data['interactions'],
@@ -133,16 +153,16 @@ class GameGenerator:
     def _create_puzzle_game(self) -> Dict[str, Any]:
         """Create an interactive puzzle game"""
         puzzle_data = self.paper_data['game_elements']['puzzle']
+        nodes, canvas = self._prepare_puzzle_nodes(puzzle_data['nodes'], puzzle_data['connections'])
         
         game_data = {
             'type': 'puzzle',
-            'title': 'Concept Connection Challenge',
-            'description': 'Connect related concepts to build a knowledge map',
+            **self.GAME_INFO['puzzle'],
             'puzzle_type': puzzle_data['type'],
-            'nodes': self._prepare_puzzle_nodes(puzzle_data['nodes']),
+            'nodes': nodes,
             'connections': puzzle_data['connections'],
             'settings': {
-                'grid_size': {'width': 800, 'height': 600},
+                'grid_size': {'width': canvas[0], 'height': canvas[1]},
                 'snap_to_grid': True,
                 'connection_strength_multiplier': 1.5,
                 'node_spacing': 100
@@ -151,37 +171,40 @@ class GameGenerator:
         
         return game_data
 
-    def _prepare_puzzle_nodes(self, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Prepare puzzle nodes with enhanced properties"""
+    def _prepare_puzzle_nodes(self, nodes: List[Dict[str, Any]],
+                              connections: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Tuple[int, int]]:
+        """Prepare puzzle nodes with enhanced properties and a precomputed layout"""
+        sizes = [(len(node['content']) * 5 + 50, 60) for node in nodes]
+        index = {node['id']: i for i, node in enumerate(nodes)}
+        edges = [(index[c['source']], index[c['target']]) for c in connections]
+        positions, canvas = layout_boxes(sizes, edges, [c['strength'] for c in connections])
+        snap_points = self._generate_snap_points(positions)
+
         prepared_nodes = []
-        
-        for node in nodes:
+        for node, size, position, snaps in zip(nodes, sizes, positions.tolist(), snap_points.tolist()):
             prepared_node = node.copy()
+            prepared_node['position'] = {'x': position[0], 'y': position[1]}
             # Add visual properties
             prepared_node['visual'] = {
                 'background_color': self._get_element_color(node['type']),
                 'border_color': '#333333',
                 'text_color': '#FFFFFF',
                 'size': {
-                    'width': len(node['content']) * 5 + 50,
-                    'height': 60
+                    'width': size[0],
+                    'height': size[1]
                 }
             }
             # Add interaction properties
             prepared_node['interaction'] = {
                 'draggable': True,
                 'connectable': True,
-                'snap_points': self._generate_snap_points(node['position'])
+                'snap_points': [{'x': x, 'y': y} for x, y in snaps]
             }
             prepared_nodes.append(prepared_node)
         
-        return prepared_nodes
+        return prepared_nodes, canvas
 
-    def _generate_snap_points(self, position: Dict[str, int]) -> List[Dict[str, int]]:
-        """Generate snap points for puzzle nodes"""
-        return [
-            {'x': position['x'], 'y': position['y'] - 30},  # Top
-            {'x': position['x'] + 30, 'y': position['y']},  # Right
-            {'x': position['x'], 'y': position['y'] + 30},  # Bottom
-            {'x': position['x'] - 30, 'y': position['y']}   # Left
-        ]
+    def _generate_snap_points(self, positions: np.ndarray) -> np.ndarray:
+        """Generate snap points (top, right, bottom, left) for every node at once"""
+        offsets = np.array([[0, -30], [30, 0], [0, 30], [-30, 0]])
+        return positions[:, None, :] + offsets[None, :, :]
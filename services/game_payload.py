@@ -0,0 +1,89 @@
+"""
+Wire formats for generated games.
+The compact format interns every long string into a table sent once with the
+game, so sentences repeated across quiz options, simulation elements and
+puzzle nodes cost a short reference each. Payloads can also be compressed
+with gzip or, when the optional brotli package is installed, brotli.
+"""
+
+import gzip
+from typing import Any, Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPACT_FORMAT = 'compact'
+COMPACT_VERSION = 1
+
+# Strings shorter than this stay inline; a reference like "~123" is no shorter
+MIN_INTERNED_LENGTH = 8
+REFERENCE_PREFIX = '~'
+
+GZIP = 'gzip'
+BROTLI = 'br'
+
+
+def supported_encodings() -> List[str]:
+    """Content encodings available here, best first."""
+    return [BROTLI, GZIP] if brotli is not None else [GZIP]
+
+
+def compact_encode(game: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace long string values with references into a shared string table.
+
+    A reference is ``"~<index>"``; inline strings that happen to start with
+    ``~`` get a second ``~`` so they can't be mistaken for one. Object keys
+    are left as they are.
+    """
+    strings: List[str] = []
+    index: Dict[str, int] = {}
+
+    def encode(value):
+        if isinstance(value, str):
+            if len(value) >= MIN_INTERNED_LENGTH:
+                if value not in index:
+                    index[value] = len(strings)
+                    strings.append(value)
+                return f"{REFERENCE_PREFIX}{index[value]}"
+            if value.startswith(REFERENCE_PREFIX):
+                return REFERENCE_PREFIX + value
+            return value
+        if isinstance(value, dict):
+            return {key: encode(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [encode(item) for item in value]
+        return value
+
+    data = encode(game)
+    return {'format': COMPACT_FORMAT, 'version': COMPACT_VERSION, 'strings': strings, 'data': data}
+
+
+def compact_decode(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of compact_encode (the browser has its own copy in static/js)."""
+    strings = payload['strings']
+
+    def decode(value):
+        if isinstance(value, str) and value.startswith(REFERENCE_PREFIX):
+            rest = value[len(REFERENCE_PREFIX):]
+            return rest if rest.startswith(REFERENCE_PREFIX) else strings[int(rest)]
+        if isinstance(value, dict):
+            return {key: decode(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [decode(item) for item in value]
+        return value
+
+    return decode(payload['data'])
+
+
+def compress(payload: bytes, encoding: Optional[str]) -> bytes:
+    """Compress a payload for the given Content-Encoding (None is identity)."""
+    if encoding is None:
+        return payload
+    if encoding == GZIP:
+        # Fixed mtime keeps the output, and so its ETag, deterministic
+        return gzip.compress(payload, compresslevel=9, mtime=0)
+    if encoding == BROTLI and brotli is not None:
+        return brotli.compress(payload)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
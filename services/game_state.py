@@ -3,20 +3,36 @@ Game state management service for the Research Paper Game Platform.
 Handles game progress, achievements, and user interaction data.
 """
 
+import copy
 import json
-from datetime import datetime
+import os
+import time
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union
 
+from services.game_state_store import GameStateStore, MemoryGameStateStore, SQLiteGameStateStore
+
+# Sessions idle for longer than this are discarded
+SESSION_TTL_SECONDS = 24 * 60 * 60
+
+# Sizes of the per-user dashboard rollup
+CHART_DAYS = 7
+RECENT_GAMES_LIMIT = 50
+RECENT_ACHIEVEMENTS_LIMIT = 5
+
 class GameState:
-    def __init__(self):
-        self.current_games: Dict[str, Dict] = {}
-        self.user_progress: Dict[str, Dict] = {}
-        self.achievements: Dict[str, List] = {}
+    def __init__(self, store: Optional[GameStateStore] = None, session_ttl: float = SESSION_TTL_SECONDS):
+        self.store = store if store is not None else MemoryGameStateStore()
+        self.session_ttl = session_ttl
+
+    def _save_session(self, session_id: str, game_data: Dict) -> None:
+        # Every update pushes the expiry forward
+        self.store.put_session(session_id, game_data, time.time() + self.session_ttl)
 
     def create_game_session(self, game_id: str, game_type: str, content: Dict) -> str:
         """Create a new game session with initial state."""
         session_id = f"{game_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        self.current_games[session_id] = {
+        self._save_session(session_id, {
             "game_id": game_id,
             "type": game_type,
             "content": content,
@@ -27,66 +43,191 @@ class GameState:
                 "discoveries": [],
                 "start_time": datetime.now().isoformat()
             }
-        }
+        })
         return session_id
 
     def update_game_state(self, session_id: str, updates: Dict) -> bool:
         """Update the state of an ongoing game session."""
-        if session_id not in self.current_games:
-            return False
-        
-        self.current_games[session_id]["state"].update(updates)
+        with self.store.transaction():
+            game_data = self.store.get_session(session_id)
+            if game_data is None:
+                return False
+
+            game_data["state"].update(updates)
+            self._save_session(session_id, game_data)
         return True
 
     def get_game_state(self, session_id: str) -> Optional[Dict]:
         """Retrieve the current state of a game session."""
-        return self.current_games.get(session_id)
+        return self.store.get_session(session_id)
 
     def award_achievement(self, user_id: str, achievement: Dict) -> None:
         """Award an achievement to a user."""
-        if user_id not in self.achievements:
-            self.achievements[user_id] = []
-        
         achievement["timestamp"] = datetime.now().isoformat()
-        self.achievements[user_id].append(achievement)
+        with self.store.transaction():
+            self.store.add_achievement(user_id, achievement)
+
+            rollup = self._get_rollup(user_id)
+            rollup["recent_achievements"] = (rollup["recent_achievements"] + [achievement])[-RECENT_ACHIEVEMENTS_LIMIT:]
+            self.store.put_rollup(user_id, rollup)
+
+    def get_achievements(self, user_id: str) -> List[Dict]:
+        """Get all achievements awarded to a user, oldest first."""
+        return self.store.list_achievements(user_id)
 
     def update_progress(self, user_id: str, game_id: str, progress: Dict) -> None:
-        """Update user's progress in a specific game."""
-        if user_id not in self.user_progress:
-            self.user_progress[user_id] = {}
-        
-        if game_id not in self.user_progress[user_id]:
-            self.user_progress[user_id][game_id] = {
-                "started_at": datetime.now().isoformat(),
-                "stages_completed": [],
-                "total_points": 0,
-                "achievements": []
-            }
-        
-        self.user_progress[user_id][game_id].update(progress)
+        """Update user's progress in a specific game.
+
+        The progress and the dashboard rollup change in one transaction, so
+        concurrent updates from other workers are never lost from either.
+        """
+        with self.store.transaction():
+            rollup = self._get_rollup(user_id)
+            game_progress = self.store.get_progress(user_id, game_id)
+            previous = copy.deepcopy(game_progress)
+            if game_progress is None:
+                game_progress = {
+                    "started_at": datetime.now().isoformat(),
+                    "stages_completed": [],
+                    "total_points": 0,
+                    "achievements": []
+                }
+
+            game_progress.update(progress)
+            self.store.put_progress(user_id, game_id, game_progress)
+
+            if (previous is None) == (game_id in rollup["game_nodes"]):
+                # The rollup disagrees with the stored progress (e.g. it was
+                # written by older code); rebuild it, this update included
+                rollup = self._build_rollup(user_id)
+            else:
+                self._apply_to_rollup(rollup, game_id, previous, game_progress)
+            self.store.put_rollup(user_id, rollup)
 
     def get_user_progress(self, user_id: str, game_id: Optional[str] = None) -> Union[Dict, List[Dict]]:
         """Get user's progress for all games or a specific game."""
-        if user_id not in self.user_progress:
-            return {} if game_id else []
-        
         if game_id:
-            return self.user_progress[user_id].get(game_id, {})
-        return self.user_progress[user_id]
+            return self.store.get_progress(user_id, game_id) or {}
+        return self.store.list_progress(user_id)
+
+    def get_dashboard(self, user_id: str) -> Dict:
+        """Totals, chart series, recent history and knowledge graph for a user.
+
+        Reads the incrementally maintained rollup, so the cost does not grow
+        with the number of games the user has played.
+        """
+        rollup = self._get_rollup(user_id)
+
+        chart_dates = []
+        chart_points = []
+        today = datetime.now()
+        for i in range(CHART_DAYS - 1, -1, -1):
+            date = today - timedelta(days=i)
+            chart_dates.append(date.strftime('%b %d'))
+            chart_points.append(rollup["points_by_day"].get(date.strftime('%Y-%m-%d'), 0))
+
+        recent_progress = self.store.get_progress_many(user_id, rollup["recent_games"])
+        game_history = [
+            {"id": game_id, **recent_progress[game_id]}
+            for game_id in rollup["recent_games"] if game_id in recent_progress
+        ]
+
+        return {
+            "total_games": rollup["total_games"],
+            "total_completed": rollup["total_completed"],
+            "total_points": rollup["total_points"],
+            "recent_achievements": rollup["recent_achievements"],
+            "game_history": game_history,
+            "chart_dates": chart_dates,
+            "chart_points": chart_points,
+            "knowledge_nodes": rollup["knowledge_nodes"],
+            "knowledge_links": rollup["knowledge_links"]
+        }
+
+    def _get_rollup(self, user_id: str) -> Dict:
+        rollup = self.store.get_rollup(user_id)
+        if rollup is None:
+            # Users with history from before rollups existed are rebuilt once
+            rollup = self._build_rollup(user_id)
+            if rollup["total_games"] or rollup["recent_achievements"]:
+                self.store.put_rollup(user_id, rollup)
+        return rollup
+
+    def _build_rollup(self, user_id: str) -> Dict:
+        """Compute a user's rollup from scratch from their progress and achievements."""
+        rollup = self._empty_rollup()
+        history = sorted(self.store.list_progress(user_id).items(), key=lambda item: item[1].get("started_at", ""))
+        for game_id, game_progress in history:
+            self._apply_to_rollup(rollup, game_id, None, game_progress)
+        rollup["recent_achievements"] = self.store.list_achievements(user_id)[-RECENT_ACHIEVEMENTS_LIMIT:]
+        return rollup
+
+    def _empty_rollup(self) -> Dict:
+        return {
+            "total_games": 0,
+            "total_completed": 0,
+            "total_points": 0,
+            "points_by_day": {},
+            "recent_games": [],
+            "recent_achievements": [],
+            "knowledge_nodes": [],
+            "knowledge_links": [],
+            "game_nodes": {},
+            "next_node_id": 0
+        }
+
+    def _add_knowledge_node(self, rollup: Dict, prefix: str, label: str, group: str) -> str:
+        node_id = f"{prefix}_{rollup['next_node_id']}"
+        rollup["next_node_id"] += 1
+        rollup["knowledge_nodes"].append({"id": node_id, "label": label, "group": group})
+        return node_id
+
+    def _apply_to_rollup(self, rollup: Dict, game_id: str, previous: Optional[Dict], current: Dict) -> None:
+        """Fold the change from ``previous`` to ``current`` progress into the rollup."""
+        if previous is None:
+            previous = {}
+            rollup["total_games"] += 1
+            rollup["recent_games"] = ([game_id] + rollup["recent_games"])[:RECENT_GAMES_LIMIT]
+            rollup["game_nodes"][game_id] = len(rollup["knowledge_nodes"])
+            self._add_knowledge_node(rollup, "game", current.get("type", "Unknown Game"), "game")
+        else:
+            game_node = rollup["knowledge_nodes"][rollup["game_nodes"][game_id]]
+            game_node["label"] = current.get("type", "Unknown Game")
+
+        was_completed = previous.get("completion_percentage", 0) == 100
+        is_completed = current.get("completion_percentage", 0) == 100
+        rollup["total_completed"] += int(is_completed) - int(was_completed)
+
+        points = current.get("total_points", 0) - previous.get("total_points", 0)
+        rollup["total_points"] += points
+        if points:
+            day = current.get("started_at", "")[:10]
+            rollup["points_by_day"][day] = rollup["points_by_day"].get(day, 0) + points
+            # Only the chart window is ever displayed
+            oldest = (datetime.now() - timedelta(days=CHART_DAYS - 1)).strftime('%Y-%m-%d')
+            rollup["points_by_day"] = {d: p for d, p in rollup["points_by_day"].items() if d >= oldest}
+
+        game_node_id = rollup["knowledge_nodes"][rollup["game_nodes"][game_id]]["id"]
+        new_achievements = current.get("achievements", [])[len(previous.get("achievements", [])):]
+        for achievement in new_achievements:
+            achievement_node_id = self._add_knowledge_node(
+                rollup, "achievement", achievement.get("name", "Unknown Achievement"), "achievement"
+            )
+            rollup["knowledge_links"].append({"source": game_node_id, "target": achievement_node_id})
 
     def end_game_session(self, session_id: str) -> Optional[Dict]:
         """End a game session and return final state."""
-        if session_id not in self.current_games:
+        game_data = self.store.get_session(session_id)
+        if game_data is None:
             return None
         
-        game_data = self.current_games[session_id]
         game_data["state"]["end_time"] = datetime.now().isoformat()
         
         # Calculate final score and achievements
         final_state = self._calculate_final_state(game_data)
         
         # Remove from active sessions
-        del self.current_games[session_id]
+        self.store.delete_session(session_id)
         
         return final_state
 
@@ -145,5 +286,7 @@ class GameState:
         
         return achievements
 
-# Global game state manager instance
-game_state_manager = GameState()
+# Global game state manager instance, shared by all workers through SQLite
+game_state_manager = GameState(
+    SQLiteGameStateStore(os.environ.get('PAPERSCAPE_GAME_STATE_DATABASE', 'game_state.sqlite3'))
+)
@@ -0,0 +1,294 @@
+"""
+Storage backends for game sessions, user progress and achievements.
+The SQLite backend is shared by every worker process using the same database
+file, writes everything through as it happens, and expires idle sessions.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import ContextManager, Dict, Iterator, List, Optional, Tuple
+
+
+class GameStateStore:
+    """Interface for game state persistence backends."""
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def put_session(self, session_id: str, session: Dict, expires_at: float) -> None:
+        raise NotImplementedError
+
+    def delete_session(self, session_id: str) -> None:
+        raise NotImplementedError
+
+    def purge_expired_sessions(self) -> int:
+        raise NotImplementedError
+
+    def get_progress(self, user_id: str, game_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def list_progress(self, user_id: str) -> Dict[str, Dict]:
+        raise NotImplementedError
+
+    def get_progress_many(self, user_id: str, game_ids: List[str]) -> Dict[str, Dict]:
+        """Progress of the given games that have any, in a single lookup."""
+        raise NotImplementedError
+
+    def put_progress(self, user_id: str, game_id: str, progress: Dict) -> None:
+        raise NotImplementedError
+
+    def add_achievement(self, user_id: str, achievement: Dict) -> None:
+        raise NotImplementedError
+
+    def list_achievements(self, user_id: str) -> List[Dict]:
+        raise NotImplementedError
+
+    def get_rollup(self, user_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def put_rollup(self, user_id: str, rollup: Dict) -> None:
+        raise NotImplementedError
+
+    def transaction(self) -> ContextManager[None]:
+        """Run the store calls made by this thread in the block as one atomic
+        unit, so read-modify-write sequences can't lose concurrent updates."""
+        raise NotImplementedError
+
+
+class MemoryGameStateStore(GameStateStore):
+    """Process-local backend for development and tests."""
+
+    def __init__(self):
+        self._sessions: Dict[str, Tuple[Dict, float]] = {}
+        self._progress: Dict[str, Dict[str, Dict]] = {}
+        self._achievements: Dict[str, List[Dict]] = {}
+        self._rollups: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._sessions[session_id]
+                return None
+            return entry[0]
+
+    def put_session(self, session_id: str, session: Dict, expires_at: float) -> None:
+        with self._lock:
+            self._sessions[session_id] = (session, expires_at)
+
+    def delete_session(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def purge_expired_sessions(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (_, expires_at) in self._sessions.items() if expires_at <= now]
+            for session_id in expired:
+                del self._sessions[session_id]
+        return len(expired)
+
+    def get_progress(self, user_id: str, game_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._progress.get(user_id, {}).get(game_id)
+
+    def list_progress(self, user_id: str) -> Dict[str, Dict]:
+        with self._lock:
+            return dict(self._progress.get(user_id, {}))
+
+    def get_progress_many(self, user_id: str, game_ids: List[str]) -> Dict[str, Dict]:
+        with self._lock:
+            progress = self._progress.get(user_id, {})
+            return {game_id: progress[game_id] for game_id in game_ids if game_id in progress}
+
+    def put_progress(self, user_id: str, game_id: str, progress: Dict) -> None:
+        with self._lock:
+            self._progress.setdefault(user_id, {})[game_id] = progress
+
+    def add_achievement(self, user_id: str, achievement: Dict) -> None:
+        with self._lock:
+            self._achievements.setdefault(user_id, []).append(achievement)
+
+    def list_achievements(self, user_id: str) -> List[Dict]:
+        with self._lock:
+            return list(self._achievements.get(user_id, []))
+
+    def get_rollup(self, user_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._rollups.get(user_id)
+
+    def put_rollup(self, user_id: str, rollup: Dict) -> None:
+        with self._lock:
+            self._rollups[user_id] = rollup
+
+
+class SQLiteGameStateStore(GameStateStore):
+    """SQLite backend in WAL mode.
+
+    Every write goes straight to the database, so every worker sees it at
+    once and nothing is lost when a worker is killed; transactions take the
+    database write lock up front (BEGIN IMMEDIATE).
+    """
+
+    # How often writes also delete expired sessions
+    PURGE_INTERVAL = 60.0
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._last_purge = 0.0
+
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " session_id TEXT PRIMARY KEY,"
+                " game_id TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " expires_at REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS sessions_game ON sessions (game_id);"
+                "CREATE INDEX IF NOT EXISTS sessions_expiry ON sessions (expires_at);"
+                "CREATE TABLE IF NOT EXISTS progress ("
+                " user_id TEXT NOT NULL,"
+                " game_id TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " PRIMARY KEY (user_id, game_id));"
+                "CREATE INDEX IF NOT EXISTS progress_game ON progress (game_id);"
+                "CREATE TABLE IF NOT EXISTS achievements ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " user_id TEXT NOT NULL,"
+                " data TEXT NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS achievements_user ON achievements (user_id, id);"
+                "CREATE TABLE IF NOT EXISTS rollups ("
+                " user_id TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL);"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit: statements outside transaction() commit on their own
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """The connection of this thread's open transaction, or a new one."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if getattr(self._local, 'conn', None) is not None:
+            # Nested: part of the enclosing transaction
+            yield
+            return
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.conn = conn
+            try:
+                yield
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            self._local.conn = None
+            conn.close()
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ? AND expires_at > ?",
+                (session_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_session(self, session_id: str, session: Dict, expires_at: float) -> None:
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, game_id, data, expires_at) VALUES (?, ?, ?, ?)",
+                (session_id, session.get("game_id", ""), json.dumps(session), expires_at)
+            )
+            if now - self._last_purge >= self.PURGE_INTERVAL:
+                self._last_purge = now
+                conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+
+    def delete_session(self, session_id: str) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge_expired_sessions(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def get_progress(self, user_id: str, game_id: str) -> Optional[Dict]:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT data FROM progress WHERE user_id = ? AND game_id = ?", (user_id, game_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_progress(self, user_id: str) -> Dict[str, Dict]:
+        with self._connection() as conn:
+            rows = conn.execute("SELECT game_id, data FROM progress WHERE user_id = ?", (user_id,)).fetchall()
+        return {game_id: json.loads(data) for game_id, data in rows}
+
+    def get_progress_many(self, user_id: str, game_ids: List[str]) -> Dict[str, Dict]:
+        if not game_ids:
+            return {}
+        placeholders = ", ".join("?" * len(game_ids))
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT game_id, data FROM progress WHERE user_id = ? AND game_id IN ({placeholders})",
+                [user_id, *game_ids]
+            ).fetchall()
+        return {game_id: json.loads(data) for game_id, data in rows}
+
+    def put_progress(self, user_id: str, game_id: str, progress: Dict) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO progress (user_id, game_id, data) VALUES (?, ?, ?)",
+                (user_id, game_id, json.dumps(progress))
+            )
+
+    def add_achievement(self, user_id: str, achievement: Dict) -> None:
+        with self._connection() as conn:
+            conn.execute("INSERT INTO achievements (user_id, data) VALUES (?, ?)", (user_id, json.dumps(achievement)))
+
+    def list_achievements(self, user_id: str) -> List[Dict]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT data FROM achievements WHERE user_id = ? ORDER BY id", (user_id,)
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def get_rollup(self, user_id: str) -> Optional[Dict]:
+        with self._connection() as conn:
+            row = conn.execute("SELECT data FROM rollups WHERE user_id = ?", (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_rollup(self, user_id: str, rollup: Dict) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO rollups (user_id, data) VALUES (?, ?)", (user_id, json.dumps(rollup))
+            )
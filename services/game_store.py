@@ -0,0 +1,151 @@
+"""
+Persistent storage for the games generated from processed papers.
+Papers themselves live in the PaperCache; each game type is generated from the
+cached paper on first request and saved, so later requests (and other
+workers) serve the stored artifact as-is. Compact and compressed variants are
+derived from it on first request and stored too. Games are namespaced by the
+paper cache's pipeline version, bounded in size and evicted least recently
+used first, along with the games of papers the cache no longer holds.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from services.game_generator import GameGenerator
+from services.game_payload import compact_encode, compress, supported_encodings
+from services.paper_cache import PaperCache
+
+
+class GameStore:
+    def __init__(self, root: str, papers: PaperCache, max_bytes: int = 256 * 1024 * 1024):
+        self.root = root
+        self.papers = papers
+        self.max_bytes = max_bytes
+        os.makedirs(self._version_dir, exist_ok=True)
+
+    @property
+    def _version_dir(self) -> str:
+        return os.path.join(self.root, self.papers.version)
+
+    def _paper_dir(self, paper_id: str) -> str:
+        # Paper ids come from URLs; never let them escape the store
+        if not paper_id or os.path.basename(paper_id) != paper_id or paper_id.startswith('.'):
+            raise ValueError(f"Invalid paper id: {paper_id}")
+        return os.path.join(self._version_dir, paper_id)
+
+    def _write(self, path: str, payload: bytes) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def paper_ids(self) -> List[str]:
+        """Ids of every paper games can be served for."""
+        return self.papers.keys()
+
+    def load_paper(self, paper_id: str) -> Optional[Dict]:
+        self._paper_dir(paper_id)  # rejects ids that are not plain names
+        return self.papers.get(paper_id, count=False)
+
+    def get_game(self, paper_id: str, game_type: str, compact: bool = False,
+                 encoding: Optional[str] = None) -> Optional[Tuple[bytes, str]]:
+        """Return the serialized game and its ETag, generating it on first use.
+
+        ``compact`` selects the string-table format and ``encoding`` a
+        Content-Encoding (see services.game_payload). Returns None when the
+        paper is unknown; raises ValueError for an unknown game type or
+        encoding.
+        """
+        if game_type not in GameGenerator.GAME_INFO:
+            raise ValueError(f"Unknown game type: {game_type}")
+        if encoding is not None and encoding not in supported_encodings():
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+
+        payload = self._variant(paper_id, game_type, compact, encoding)
+        if payload is None:
+            return None
+        # The directory's modification time doubles as the LRU timestamp
+        try:
+            os.utime(self._paper_dir(paper_id))
+        except OSError:
+            pass
+        return payload, hashlib.sha256(payload).hexdigest()
+
+    def _variant(self, paper_id: str, game_type: str, compact: bool, encoding: Optional[str]) -> Optional[bytes]:
+        name = f"{game_type}.compact.json" if compact else f"{game_type}.json"
+        if encoding is not None:
+            name = f"{name}.{encoding}"
+        path = os.path.join(self._paper_dir(paper_id), name)
+        try:
+            with open(path, 'rb') as file:
+                return file.read()
+        except FileNotFoundError:
+            pass
+
+        # Each variant is derived from the next simpler one
+        if encoding is not None:
+            identity = self._variant(paper_id, game_type, compact, None)
+            if identity is None:
+                return None
+            payload = compress(identity, encoding)
+        elif compact:
+            plain = self._variant(paper_id, game_type, False, None)
+            if plain is None:
+                return None
+            payload = json.dumps(compact_encode(json.loads(plain)), separators=(',', ':')).encode('utf-8')
+        else:
+            paper_data = self.load_paper(paper_id)
+            if paper_data is None:
+                return None
+            game = GameGenerator(paper_data).generate_game(game_type)
+            game['id'] = f"{paper_id}_{game_type}"
+            payload = json.dumps(game).encode('utf-8')
+
+        self._write(path, payload)
+        self.evict()
+        return payload
+
+    def _entries(self):
+        """Yield (mtime, size, path) for the games directory of every current paper."""
+        for paper_id in os.listdir(self._version_dir):
+            path = os.path.join(self._version_dir, paper_id)
+            try:
+                mtime = os.stat(path).st_mtime
+                size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            except OSError:
+                continue
+            yield mtime, size, path
+
+    def evict(self) -> int:
+        """Remove games of older pipeline versions and of papers no longer
+        cached, then least recently used games until the store fits its budget."""
+        removed = 0
+        for version in os.listdir(self.root):
+            if version != self.papers.version:
+                shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
+                removed += 1
+        for paper_id in os.listdir(self._version_dir):
+            if not self.papers.contains(paper_id):
+                shutil.rmtree(os.path.join(self._version_dir, paper_id), ignore_errors=True)
+                removed += 1
+
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
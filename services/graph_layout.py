@@ -0,0 +1,138 @@
+"""
+Server-side layout for concept graphs.
+Positions every node at once with a vectorized Fruchterman-Reingold force
+simulation, then pushes apart any boxes that still overlap (falling back to a
+grid for graphs too large or dense for that), so clients can draw the graph
+as-is instead of running their own simulation. Layouts are deterministic:
+the same graph always gets the same positions.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Pairwise forces cost n² time and memory per iteration; larger graphs are
+# laid out on a grid
+MAX_FORCE_NODES = 300
+
+# Empty space kept between node boxes and around the drawing
+NODE_GAP = 20
+MARGIN = 50
+
+
+def _initial_positions(n: int, radius: float) -> np.ndarray:
+    # Evenly spaced on a circle: deterministic and free of coincident points
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.column_stack([np.cos(angles), np.sin(angles)]) * radius
+
+
+def force_directed(n: int, edges: Sequence[Tuple[int, int]], weights: Sequence[float] = None,
+                   area: float = 800 * 600, iterations: int = 100) -> np.ndarray:
+    """Return an (n, 2) array of Fruchterman-Reingold positions centered on the origin.
+
+    Nodes stay inside a 4:3 frame of the given area.
+    """
+    if n == 0:
+        return np.zeros((0, 2))
+    k = np.sqrt(area / n)
+    frame = np.array([np.sqrt(area * 4 / 3), np.sqrt(area * 3 / 4)]) / 2
+    positions = _initial_positions(n, 1.0) * frame
+    if n == 1 or not len(edges):
+        return positions
+
+    edges = np.asarray(edges, dtype=np.intp)
+    weights = np.ones(len(edges)) if weights is None else np.asarray(weights, dtype=float)
+    temperature = np.sqrt(area) / 10
+
+    for _ in range(iterations):
+        delta = positions[:, None, :] - positions[None, :, :]
+        distance = np.maximum(np.linalg.norm(delta, axis=2), 0.01)
+        # Repulsion k²/d between every pair (the diagonal has zero delta)
+        displacement = (delta * (k * k / distance ** 2)[:, :, None]).sum(axis=1)
+
+        # Attraction d²/k along edges, scaled by edge weight
+        edge_delta = positions[edges[:, 0]] - positions[edges[:, 1]]
+        edge_distance = np.maximum(np.linalg.norm(edge_delta, axis=1), 0.01)
+        pull = edge_delta * (weights * edge_distance / k)[:, None]
+        np.subtract.at(displacement, edges[:, 0], pull)
+        np.add.at(displacement, edges[:, 1], pull)
+
+        # Move at most the current temperature, which cools linearly
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 0.01)
+        positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+        np.clip(positions, -frame, frame, out=positions)
+        temperature -= temperature / (iterations + 1)
+
+    return positions
+
+
+def grid(sizes: np.ndarray) -> np.ndarray:
+    """Return positions for boxes of the given (width, height) on a roughly 4:3 grid."""
+    n = len(sizes)
+    cell = sizes.max(axis=0) + NODE_GAP
+    columns = max(1, int(np.ceil(np.sqrt(n * cell[1] / cell[0] * 4 / 3))))
+    index = np.arange(n)
+    return np.column_stack([index % columns, index // columns]) * cell
+
+
+def _overlapping(positions: np.ndarray, half: np.ndarray, upper: np.ndarray):
+    delta = positions[:, None, :] - positions[None, :, :]
+    overlap = half[:, None, :] + half[None, :, :] - np.abs(delta)
+    return delta, overlap, (overlap > 0).all(axis=2) & upper
+
+
+def remove_overlaps(positions: np.ndarray, sizes: np.ndarray, iterations: int = 100) -> Optional[np.ndarray]:
+    """Push apart boxes (centered on ``positions``) until none overlap.
+
+    Each overlapping pair is separated along the axis needing the smaller
+    move, half by each box. Returns None if boxes still overlap after
+    ``iterations`` rounds.
+    """
+    positions = positions.copy()
+    half = (sizes + NODE_GAP) / 2
+    upper = np.triu(np.ones((len(positions), len(positions)), dtype=bool), 1)
+
+    for _ in range(iterations):
+        delta, overlap, overlapping = _overlapping(positions, half, upper)
+        if not overlapping.any():
+            return positions
+
+        i, j = np.nonzero(overlapping)
+        axis = np.argmin(overlap[i, j], axis=1)
+        # Coincident boxes are split in index order
+        direction = np.where(delta[i, j, axis] >= 0, 1.0, -1.0)
+        push = np.zeros((len(i), 2))
+        push[np.arange(len(i)), axis] = direction * overlap[i, j, axis] / 2
+
+        shift = np.zeros_like(positions)
+        np.add.at(shift, i, push)
+        np.subtract.at(shift, j, push)
+        positions += shift
+
+    return None if _overlapping(positions, half, upper)[2].any() else positions
+
+
+def layout_boxes(sizes: Sequence[Tuple[float, float]], edges: Sequence[Tuple[int, int]],
+                 weights: Sequence[float] = None) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """Lay out boxes of (width, height) connected by ``edges``.
+
+    Returns integer center positions, all at least ``MARGIN`` from the top
+    left corner, and the (width, height) of the canvas that contains them.
+    """
+    sizes = np.asarray(sizes, dtype=float).reshape(-1, 2)
+    n = len(sizes)
+    if n == 0:
+        return np.zeros((0, 2), dtype=int), (2 * MARGIN, 2 * MARGIN)
+
+    positions = None
+    if n <= MAX_FORCE_NODES:
+        # Give the simulation roughly the room the boxes need
+        area = float(((sizes + NODE_GAP).prod(axis=1)).sum()) * 2
+        positions = remove_overlaps(force_directed(n, edges, weights, area=area), sizes)
+    if positions is None:
+        positions = grid(sizes)
+
+    corner = (positions - sizes / 2).min(axis=0)
+    positions = np.rint(positions - corner + MARGIN).astype(int)
+    extent = (positions + sizes / 2).max(axis=0) + MARGIN
+    return positions, (int(np.ceil(extent[0])), int(np.ceil(extent[1])))
@@ -0,0 +1,242 @@
+"""
+Lightweight per-stage instrumentation for the paper pipeline.
+Each instrumented stage records wall time, CPU time and input size, logs a
+structured line with the process's peak RSS so far and adds to per-process
+totals. Totals are written to one file per process under the metrics
+directory, so the web workers can export what the job workers measured in
+Prometheus text format; a process folds its totals into a shared file of
+retired totals when it exits, so the exported counters never go backwards.
+When disabled a stage costs a single attribute check.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing.util import Finalize
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = 'paperscape_stage'
+
+# Totals of processes that have exited
+RETIRED_NAME = 'retired.json'
+
+STAGE_TOTALS = ('runs', 'wall_seconds', 'cpu_seconds', 'input_size')
+
+
+def peak_rss() -> Optional[int]:
+    """High-water mark of this process's resident set size in bytes, if available.
+
+    This covers the whole life of the process, not any one stage.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+class Instrumentation:
+    def __init__(self, metrics_dir: str, enabled: bool = True):
+        self.metrics_dir = metrics_dir
+        self.enabled = enabled
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        # (pid, totals file name) of the process that owns self._totals
+        self._owner = None
+
+    @contextmanager
+    def stage(self, name: str, input_size: Optional[int] = None) -> Iterator[Dict]:
+        """Measure the enclosed block as one run of ``name``.
+
+        The block may set ``input_size`` on the yielded record once it is
+        known, and ``nested_wall_seconds``/``nested_cpu_seconds`` for time
+        spent in work recorded as a separate stage (such as lazily extracted
+        pages consumed by a parse). Blocks that raise are not recorded.
+        """
+        record = {'input_size': input_size, 'nested_wall_seconds': 0.0, 'nested_cpu_seconds': 0.0}
+        if not self.enabled:
+            yield record
+            return
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        yield record
+        self.record(
+            name,
+            time.perf_counter() - wall_start - record['nested_wall_seconds'],
+            time.process_time() - cpu_start - record['nested_cpu_seconds'],
+            record['input_size']
+        )
+
+    def record(self, name: str, wall_seconds: float, cpu_seconds: float,
+               input_size: Optional[int] = None) -> None:
+        """Add one run of a stage measured by the caller."""
+        if not self.enabled:
+            return
+
+        rss = peak_rss()
+        logger.info(json.dumps({
+            'event': 'stage',
+            'stage': name,
+            'wall_seconds': round(wall_seconds, 6),
+            'cpu_seconds': round(cpu_seconds, 6),
+            'process_peak_rss_bytes': rss,
+            'input_size': input_size,
+            'pid': os.getpid()
+        }))
+
+        with self._lock:
+            filename = self._totals_filename()
+            totals = self._totals.setdefault(name, dict.fromkeys(STAGE_TOTALS, 0))
+            totals['runs'] += 1
+            totals['wall_seconds'] += wall_seconds
+            totals['cpu_seconds'] += cpu_seconds
+            totals['input_size'] += input_size or 0
+            self._save(filename, {
+                'stages': {stage: dict(values) for stage, values in self._totals.items()},
+                'peak_rss_bytes': rss or 0
+            })
+
+    def _totals_filename(self) -> str:
+        """Name of this process's totals file; called with the lock held.
+
+        The start time keeps a reused pid from overwriting the totals of an
+        earlier process that could not retire them.
+        """
+        pid = os.getpid()
+        if self._owner is None or self._owner[0] != pid:
+            # Forked: the totals inherited from the parent are the parent's
+            self._totals = {}
+            self._owner = (pid, f"{pid}-{int(time.time() * 1000)}.json")
+            # Also runs on the exit of multiprocessing children, which skip atexit
+            Finalize(None, self.retire, exitpriority=10)
+        return self._owner[1]
+
+    def _save(self, filename: str, data: Dict) -> None:
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.metrics_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(tmp_path, os.path.join(self.metrics_dir, filename))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _load(self, filename: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.metrics_dir, filename), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _merge(target: Dict, data: Dict) -> None:
+        for stage, values in data.get('stages', {}).items():
+            stage_totals = target['stages'].setdefault(stage, dict.fromkeys(STAGE_TOTALS, 0))
+            for key in STAGE_TOTALS:
+                stage_totals[key] += values.get(key, 0)
+        target['peak_rss_bytes'] = max(target['peak_rss_bytes'], data.get('peak_rss_bytes', 0))
+
+    def retire(self) -> None:
+        """Fold this process's totals into the retired totals and remove its file.
+
+        Runs when the process exits; a process killed outright leaves its
+        file behind, which is still collected.
+        """
+        with self._lock:
+            if self._owner is None or self._owner[0] != os.getpid():
+                return
+            filename = self._owner[1]
+            own = self._load(filename)
+            if own is None:
+                return
+            try:
+                with open(os.path.join(self.metrics_dir, '.retired.lock'), 'a') as lock:
+                    if fcntl is not None:
+                        fcntl.flock(lock, fcntl.LOCK_EX)
+                    retired = self._load(RETIRED_NAME) or {'stages': {}, 'peak_rss_bytes': 0}
+                    self._merge(retired, own)
+                    # Listed until removed, so collect() never counts it twice
+                    retired['files'] = [
+                        name for name in retired.get('files', [])
+                        if os.path.exists(os.path.join(self.metrics_dir, name))
+                    ] + [filename]
+                    self._save(RETIRED_NAME, retired)
+                    os.remove(os.path.join(self.metrics_dir, filename))
+            except OSError:
+                logger.warning("Could not retire instrumentation totals %s", filename)
+
+    def collect(self) -> Dict:
+        """Totals per stage across every process sharing the metrics directory,
+        live or retired, and the highest process peak RSS among them."""
+        combined = {'stages': {}, 'peak_rss_bytes': 0}
+        try:
+            filenames = os.listdir(self.metrics_dir)
+        except FileNotFoundError:
+            return combined
+
+        live = {}
+        for filename in filenames:
+            if filename.endswith('.json') and filename != RETIRED_NAME:
+                data = self._load(filename)
+                if data is not None:
+                    live[filename] = data
+        # Read last: a process retiring meanwhile is then counted exactly once
+        retired = self._load(RETIRED_NAME)
+        if retired is not None:
+            self._merge(combined, retired)
+            for filename in retired.get('files', []):
+                live.pop(filename, None)
+        for data in live.values():
+            self._merge(combined, data)
+        return combined
+
+    def prometheus(self) -> str:
+        """Render the collected totals in the Prometheus text exposition format."""
+        collected = self.collect()
+        totals = collected['stages']
+        metrics = [
+            ('runs_total', 'counter', 'Completed runs of the stage', 'runs'),
+            ('wall_seconds_total', 'counter', 'Wall-clock time spent in the stage', 'wall_seconds'),
+            ('cpu_seconds_total', 'counter', 'CPU time spent in the stage', 'cpu_seconds'),
+            ('input_size_total', 'counter', 'Input units (pages, sentences, concepts) processed', 'input_size')
+        ]
+        lines = []
+        for suffix, kind, help_text, key in metrics:
+            name = f"{METRIC_PREFIX}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stage in sorted(totals):
+                lines.append(f'{name}{{stage="{stage}"}} {totals[stage][key]}')
+        name = 'paperscape_process_peak_rss_bytes'
+        lines.append(f"# HELP {name} Highest peak RSS of any process that ran a stage")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {collected['peak_rss_bytes']}")
+        return '\n'.join(lines) + '\n'
+
+
+def _enabled_from_env() -> bool:
+    return os.environ.get('PAPERSCAPE_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes')
+
+
+# Global instance shared by the pipeline, the game store and /metrics
+instrumentation = Instrumentation(
+    os.environ.get('PAPERSCAPE_METRICS_DIR', 'metrics'),
+    enabled=_enabled_from_env()
+)
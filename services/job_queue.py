@@ -0,0 +1,342 @@
+"""
+Background job queue for the Research Paper Game Platform.
+Runs long paper-processing tasks in a local process pool while job status,
+progress events and results live in a pluggable store, so any web worker can
+answer status polls and stream progress.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+logger = logging.getLogger(__name__)
+
+
+class JobStore:
+    """Interface for job persistence backends.
+
+    Stores are handed to the worker processes, so they must be picklable and
+    their changes must be visible to every process.
+    """
+
+    def create(self, job_id: str, metadata: Optional[Dict] = None, owner: Optional[int] = None) -> Dict:
+        """Record a queued job; ``owner`` is the pid of the process whose pool runs it."""
+        raise NotImplementedError
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def list_unfinished(self) -> List[Dict]:
+        """Jobs still queued or running."""
+        raise NotImplementedError
+
+    def add_event(self, job_id: str, event: Dict) -> None:
+        raise NotImplementedError
+
+    def list_events(self, job_id: str, after: int = 0) -> List[Dict]:
+        """Events recorded for a job with an id greater than ``after``, oldest first.
+
+        Each event carries its increasing ``id`` so callers can resume.
+        """
+        raise NotImplementedError
+
+    def purge_events(self, finished_before: datetime) -> int:
+        """Delete the events of jobs that finished before ``finished_before``.
+
+        Returns the number of events deleted.
+        """
+        raise NotImplementedError
+
+
+class SQLiteJobStore(JobStore):
+    """Persistent store shared by every process that opens the same database file."""
+
+    _COLUMNS = ("status", "metadata", "result", "error")
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " metadata TEXT,"
+                " result TEXT,"
+                " error TEXT,"
+                " owner INTEGER,"
+                " created_at TEXT NOT NULL,"
+                " updated_at TEXT NOT NULL)"
+            )
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner INTEGER")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_events ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " job_id TEXT NOT NULL,"
+                " data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS job_events_job ON job_events (job_id, id)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, job_id: str, metadata: Optional[Dict] = None, owner: Optional[int] = None) -> Dict:
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, metadata, owner, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(metadata or {}), owner, now, now)
+            )
+        return self.get(job_id)
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        unknown = set(fields) - set(self._COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+
+        values = [
+            json.dumps(value) if name in ("metadata", "result") else value
+            for name, value in fields.items()
+        ]
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?",
+                values + [datetime.now().isoformat(), job_id]
+            )
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return self._decode(row)
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job["metadata"] = json.loads(job["metadata"]) if job["metadata"] else {}
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def list_unfinished(self) -> List[Dict]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def add_event(self, job_id: str, event: Dict) -> None:
+        with self._connect() as conn:
+            conn.execute("INSERT INTO job_events (job_id, data) VALUES (?, ?)", (job_id, json.dumps(event)))
+
+    def list_events(self, job_id: str, after: int = 0) -> List[Dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, data FROM job_events WHERE job_id = ? AND id > ? ORDER BY id", (job_id, after)
+            ).fetchall()
+        return [{**json.loads(row["data"]), "id": row["id"]} for row in rows]
+
+    def purge_events(self, finished_before: datetime) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM job_events WHERE job_id IN ("
+                " SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?)",
+                (DONE, FAILED, finished_before.isoformat())
+            )
+        return cursor.rowcount
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Alive, but owned by another user
+        return True
+    return True
+
+
+# The job running in this worker process, for report_progress, and the
+# stage it last reported
+_current_job: Optional[Tuple[JobStore, str]] = None
+_current_stage: Optional[str] = None
+
+
+def report_progress(event: Dict) -> None:
+    """Record a progress event for the job running in this process, if any."""
+    global _current_stage
+    if _current_job is not None:
+        store, job_id = _current_job
+        _current_stage = event.get('stage', _current_stage)
+        store.add_event(job_id, event)
+
+
+def _run_job(store: JobStore, job_id: str, task: Callable, args: tuple) -> Any:
+    """Entry point executed inside a pool worker process."""
+    global _current_job, _current_stage
+    store.update(job_id, status=RUNNING)
+    _current_job = (store, job_id)
+    _current_stage = None
+    try:
+        return task(job_id, *args)
+    except Exception as e:
+        # Tell progress streams which stage failed; the job itself is
+        # marked failed once the pool hands the error back
+        try:
+            store.add_event(job_id, {
+                'stage': _current_stage or 'job', 'status': 'failed',
+                'error': str(e) or e.__class__.__name__
+            })
+        except Exception:
+            logger.exception("Could not record the failure of job %s", job_id)
+        raise
+    finally:
+        _current_job = None
+        _current_stage = None
+
+
+class JobQueue:
+    """Submits tasks to a process pool and records their outcome in a JobStore.
+
+    With ``max_tasks_per_pool`` the pool is replaced after that many tasks,
+    so memory leaked by long-lived worker processes is returned; tasks
+    already running on the old pool finish there. Progress events are kept
+    for ``events_ttl`` seconds after their job finishes, for streams that
+    reconnect late.
+    """
+
+    def __init__(self, store: JobStore, max_workers: Optional[int] = None,
+                 initializer: Optional[Callable[[], None]] = None,
+                 max_tasks_per_pool: Optional[int] = None,
+                 events_ttl: float = 3600):
+        self.store = store
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.max_tasks_per_pool = max_tasks_per_pool
+        self.events_ttl = events_ttl
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._submitted = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use so that pre-forking servers start the pool in
+        # each worker rather than sharing one inherited from the master.
+        with self._lock:
+            if self._executor is not None and self.max_tasks_per_pool and self._submitted >= self.max_tasks_per_pool:
+                # A fork-based replacement pool still shares preloaded models,
+                # which max_tasks_per_child (spawn only) would not
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._executor is not None and getattr(self._executor, '_broken', False):
+                # A worker process died abruptly; the pool accepts no more tasks
+                logger.warning("Replacing a broken job pool")
+                self._discard(self._executor)
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer)
+                self._submitted = 0
+            self._submitted += 1
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Stop using ``executor``, unless it was replaced already. Caller holds ``_lock``."""
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False)
+
+    def submit(self, task: Callable, *args: Any, metadata: Optional[Dict] = None) -> Dict:
+        """Queue a task and return the newly created job record.
+
+        The task is called as ``task(job_id, *args)`` in a worker process and
+        must be a picklable, module-level function.
+        """
+        job_id = uuid.uuid4().hex
+        job = self.store.create(job_id, metadata, owner=os.getpid())
+
+        try:
+            try:
+                executor = self._get_executor()
+                future = executor.submit(_run_job, self.store, job_id, task, args)
+            except BrokenProcessPool:
+                # Broken since the check in _get_executor; retry on a fresh pool
+                with self._lock:
+                    self._discard(executor)
+                future = self._get_executor().submit(_run_job, self.store, job_id, task, args)
+        except BaseException as e:
+            # Nothing will ever run the job, and sweep() leaves it alone
+            # while this process lives
+            self.store.update(job_id, status=FAILED, error=f"Could not queue the job: {e}")
+            raise
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return job
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        # Errors raised here would be swallowed by the future and leave the
+        # job running forever
+        error = future.exception()
+        try:
+            if error is not None:
+                self.store.update(job_id, status=FAILED, error=str(error) or error.__class__.__name__)
+            else:
+                self.store.update(job_id, status=DONE, result=future.result())
+        except Exception as e:
+            logger.exception("Could not record the outcome of job %s", job_id)
+            self.store.update(job_id, status=FAILED, error=f"Could not store the job result: {e}")
+        self.purge_events()
+
+    def purge_events(self) -> int:
+        """Delete the events of jobs that finished more than ``events_ttl`` seconds ago."""
+        try:
+            return self.store.purge_events(datetime.now() - timedelta(seconds=self.events_ttl))
+        except Exception:
+            logger.exception("Could not purge old job events")
+            return 0
+
+    def sweep(self) -> int:
+        """Fail queued or running jobs whose owning process has exited.
+
+        Their pool went down with the process, so nothing would ever finish
+        them. Returns the number of jobs failed.
+        """
+        failed = 0
+        for job in self.store.list_unfinished():
+            if job["owner"] is not None and _process_exists(job["owner"]):
+                continue
+            self.store.update(
+                job["id"], status=FAILED,
+                error="Processing was interrupted by a restart; please upload the paper again"
+            )
+            failed += 1
+        if failed:
+            logger.warning("Failed %d jobs interrupted by a restart", failed)
+        return failed
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
+
+    def events(self, job_id: str, after: int = 0) -> List[Dict]:
+        return self.store.list_events(job_id, after)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
@@ -0,0 +1,130 @@
+"""
+Process-wide registry for the NLP models used by the paper pipeline.
+Models are loaded lazily on first use, at most once per process, and can be
+preloaded before a server forks so workers share the pages copy-on-write.
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = 'en_core_web_sm'
+SUMMARIZER_MODEL = 'facebook/bart-large-cnn'
+
+
+def _current_rss() -> Optional[int]:
+    """Return the resident set size of this process in bytes, if available."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is a high-water mark (KiB on Linux, bytes on macOS), which is
+    # the closest portable approximation when /proc is unavailable.
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._metrics: Dict[str, Dict] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Register a zero-argument loader for a model name."""
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Any:
+        """Return a model, loading it on first access."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._locks[name]:
+            # Another thread may have finished loading while we waited
+            if name not in self._models:
+                self._models[name] = self._load(name)
+            return self._models[name]
+
+    def _load(self, name: str) -> Any:
+        rss_before = _current_rss()
+        start = time.perf_counter()
+        model = self._loaders[name]()
+        load_seconds = time.perf_counter() - start
+        rss_after = _current_rss()
+
+        rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        self._metrics[name] = {
+            'load_seconds': load_seconds,
+            'rss_delta_bytes': rss_delta,
+            'loaded_at': datetime.now().isoformat(),
+            'pid': os.getpid()
+        }
+        logger.info("Loaded model %s in %.2fs (rss delta: %s bytes)", name, load_seconds, rss_delta)
+        return model
+
+    def preload(self, names: Optional[Iterable[str]] = None) -> None:
+        """Load the given models (default: all registered) ahead of first use."""
+        for name in (names if names is not None else list(self._loaders)):
+            self.get(name)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def status(self) -> Dict[str, Dict]:
+        """Report load state and load metrics for every registered model."""
+        return {
+            name: {'loaded': name in self._models, **self._metrics.get(name, {})}
+            for name in self._loaders
+        }
+
+    def prepare_for_fork(self) -> None:
+        """Move loaded objects out of the garbage collector's reach before forking.
+
+        Without this, the first collection in each child writes to the GC
+        header of every model object and un-shares their memory pages.
+        """
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load(SPACY_MODEL)
+
+
+def _load_summarizer():
+    from transformers import pipeline
+    return pipeline("summarization", model=SUMMARIZER_MODEL)
+
+
+# Global model registry instance
+model_registry = ModelRegistry()
+model_registry.register('spacy', _load_spacy)
+model_registry.register('summarizer', _load_summarizer)
+
+
+def preload_models(names: Optional[Iterable[str]] = None) -> None:
+    """Preload the given models (default: all registered); used as a worker initializer."""
+    model_registry.preload(names)
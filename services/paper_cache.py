@@ -0,0 +1,137 @@
+"""
+Content-addressed on-disk cache of processed papers.
+Entries are keyed by the SHA-256 of the uploaded file and namespaced by the
+pipeline version, so results computed by older code or models are never
+served. The cache is bounded in size and evicts least recently used entries.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+
+class PaperCache:
+    def __init__(self, root: str, version: str, max_bytes: int = 512 * 1024 * 1024):
+        self.root = root
+        self.version = version
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        os.makedirs(self._version_dir, exist_ok=True)
+
+    def __getstate__(self):
+        # Instances are handed to job worker processes; locks can't be pickled
+        # and the counters belong to the process that did the lookups
+        return {'root': self.root, 'version': self.version, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def _version_dir(self) -> str:
+        return os.path.join(self.root, self.version)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self._version_dir, f"{digest}.json")
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def get(self, digest: str, count: bool = True) -> Optional[Dict]:
+        """Return the cached processing result for a file digest, if any.
+
+        Lookups that are not repeat uploads (e.g. generating a game) pass
+        ``count=False`` to stay out of the hit/miss counters.
+        """
+        path = self._path(digest)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            if count:
+                self._count('misses')
+            return None
+
+        # The modification time doubles as the LRU timestamp
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        if count:
+            self._count('hits')
+        return data
+
+    def contains(self, digest: str) -> bool:
+        return os.path.isfile(self._path(digest))
+
+    def keys(self) -> List[str]:
+        """Digests of every entry for the current pipeline version."""
+        try:
+            filenames = sorted(os.listdir(self._version_dir))
+        except FileNotFoundError:
+            return []
+        return [filename[:-len('.json')] for filename in filenames if filename.endswith('.json')]
+
+    def put(self, digest: str, data: Dict) -> None:
+        """Store a processing result and evict old entries if over budget."""
+        os.makedirs(self._version_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._version_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self._path(digest))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._count('writes')
+        self.evict()
+
+    def _entries(self):
+        """Yield (mtime, size, path) for every entry across all versions."""
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith('.json'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits its budget."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            self._count('evictions', removed)
+        return removed
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for this process plus the current on-disk footprint."""
+        entries = list(self._entries())
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['hits'] + counters['misses']
+        return {
+            **counters,
+            'hit_ratio': counters['hits'] / lookups if lookups else 0.0,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'version': self.version
+        }
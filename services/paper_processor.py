@@ -1,102 +1,150 @@
 import os
 import json
-import spacy
+import time
+from contextlib import contextmanager
 import PyPDF2
 import numpy as np
-from gensim.summarization import summarize
-from transformers import pipeline
-from pdfminer.high_level import extract_text
+
+from services.model_registry import model_registry
+from services.document_analysis import analyze_document
+from services.summarizer import summarize, ABSTRACTIVE
+from services.pdf_extraction import iter_pages
+from services.concept_index import KeywordIndex
+from services.concept_ranking import rank_concepts, DEFAULT_MAX_PER_TYPE
+from services.instrumentation import instrumentation
+
+# Bump whenever the structure or content of process_paper output changes, so
+# cached results from older code are not reused
+PIPELINE_VERSION = 7
 
 class PaperProcessor:
-    def __init__(self):
-        self.nlp = spacy.load('en_core_web_sm')
-        self.summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+    def __init__(self, pdf_backend=None, extraction_workers=None, max_edges_per_concept=10,
+                 max_concepts_per_type=DEFAULT_MAX_PER_TYPE, max_keyword_df=None):
+        # Shared per process; loading these costs seconds and gigabytes
+        self.nlp = model_registry.get('spacy')
+        self.pdf_backend = pdf_backend
+        self.extraction_workers = extraction_workers
+        # Keeps simulation and puzzle graphs renderable; None keeps every edge
+        self.max_edges_per_concept = max_edges_per_concept
+        # Ignore keywords shared by more concepts than this; None ignores none
+        self.max_keyword_df = max_keyword_df
+        # Bounds every game's payload; None keeps every matching sentence
+        self.max_concepts_per_type = max_concepts_per_type
         self.key_phrases = []
         self.summary = ""
         self.concepts = []
+        self.related_concepts = []
+        self.progress = None
+        self._extraction = {'pages': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0}
+
+    @property
+    def summarizer(self):
+        """Transformer summarization pipeline, loaded only when first needed"""
+        return model_registry.get('summarizer')
+
+    def process_paper(self, file_path, summary_mode=ABSTRACTIVE, progress=None):
+        """Process the uploaded research paper
+
+        ``progress``, if given, is called with an event dict as each stage
+        (extract, parse, summarize, concepts, games) starts and finishes, and
+        once per extracted page.
+        """
+        self.progress = progress
+
+        # Pages stream straight into the parser as they are decoded, and
+        # the parse is shared between the extractors
+        self._extraction = {'pages': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0}
+        with self._stage('parse') as parse:
+            analysis = analyze_document(self.nlp, self._extract_pages(file_path))
+            parse.update(
+                input_size=self._extraction['pages'],
+                sections=analysis['sections'],
+                sentences=len(analysis['sentences']),
+                nested_wall_seconds=self._extraction['wall_seconds'],
+                nested_cpu_seconds=self._extraction['cpu_seconds']
+            )
+
+        sentences = len(analysis['sentences'])
+        with self._stage('summarize', input_size=sentences, mode=summary_mode, sentences=sentences):
+            self.summary = self._generate_summary(analysis, summary_mode)
+
+        with self._stage('concepts', input_size=sentences) as concepts:
+            self.key_phrases = self._extract_key_phrases(analysis)
+            self.concepts = self._identify_concepts(analysis)
+            concepts.update(concepts=len(self.concepts), key_phrases=len(self.key_phrases))
+
+        with self._stage('games', input_size=len(self.concepts)):
+            return self._prepare_game_data()
+
+    def _report(self, event):
+        if self.progress is not None:
+            self.progress(event)
+
+    @contextmanager
+    def _stage(self, stage, input_size=None, **details):
+        """Instrument a stage and report its start and, with its duration and
+        the details the block adds to the yielded dict, its completion
+
+        ``input_size`` and ``nested_*_seconds`` set by the block go to the
+        instrumentation rather than the progress events.
+        """
+        self._report({'stage': stage, 'status': 'started', **details})
+        start = time.perf_counter()
+        with instrumentation.stage(stage, input_size) as record:
+            yield details
+            for key in ('input_size', 'nested_wall_seconds', 'nested_cpu_seconds'):
+                if key in details:
+                    record[key] = details.pop(key)
+        self._report({
+            'stage': stage,
+            'status': 'done',
+            'seconds': round(time.perf_counter() - start, 3),
+            **details
+        })
+
+    def _extract_pages(self, file_path):
+        """Lazily extract page texts from a PDF or text file"""
+        self._report({'stage': 'extract', 'status': 'started'})
+        extraction = self._extraction
+        pages = iter_pages(file_path, backend=self.pdf_backend, workers=self.extraction_workers)
+        while True:
+            # Only time spent decoding counts; the parser runs between pages
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            page = next(pages, None)
+            extraction['wall_seconds'] += time.perf_counter() - wall_start
+            extraction['cpu_seconds'] += time.process_time() - cpu_start
+            if page is None:
+                break
+            extraction['pages'] += 1
+            self._report({'stage': 'extract', 'status': 'progress', 'pages': extraction['pages']})
+            yield page
 
-    def process_paper(self, file_path):
-        """Process the uploaded research paper"""
-        text = self._extract_text(file_path)
-        self.summary = self._generate_summary(text)
-        self.key_phrases = self._extract_key_phrases(text)
-        self.concepts = self._identify_concepts(text)
-        return self._prepare_game_data()
-
-    def _extract_text(self, file_path):
-        """Extract text from PDF or text file"""
-        if file_path.endswith('.pdf'):
-            return extract_text(file_path)
-        else:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-
-    def _generate_summary(self, text):
+        instrumentation.record(
+            'extract', extraction['wall_seconds'], extraction['cpu_seconds'], extraction['pages']
+        )
+        self._report({
+            'stage': 'extract',
+            'status': 'done',
+            'pages': extraction['pages'],
+            'seconds': round(extraction['wall_seconds'], 3)
+        })
+
+    def _generate_summary(self, analysis, summary_mode=ABSTRACTIVE):
         """Generate a concise summary of the paper"""
-        try:
-            chunks = [text[i:i + 1024] for i in range(0, len(text), 1024)]
-            summaries = []
-            for chunk in chunks:
-                summary = self.summarizer(chunk, max_length=130, min_length=30, do_sample=False)
-                summaries.append(summary[0]['summary_text'])
-            return ' '.join(summaries)
-        except Exception as e:
-            print(f"Error generating summary: {e}")
-            return text[:1000]  # Fallback to first 1000 characters
-
-    def _extract_key_phrases(self, text):
-        """Extract key phrases from the text"""
-        doc = self.nlp(text)
-        key_phrases = []
-        
-        for sent in doc.sents:
-            # Extract noun phrases
-            for chunk in sent.noun_chunks:
-                if len(chunk.text.split()) >= 2:  # Only phrases with 2+ words
-                    key_phrases.append(chunk.text)
-        
-        # Extract named entities
-        for ent in doc.ents:
-            if ent.label_ in ['ORG', 'PRODUCT', 'WORK_OF_ART', 'LAW', 'LANGUAGE']:
-                key_phrases.append(ent.text)
-        
-        return list(set(key_phrases))  # Remove duplicates
+        return summarize(analysis['sentences'], summary_mode, lambda: self.summarizer)
 
-    def _identify_concepts(self, text):
-        """Identify main concepts from the paper"""
-        doc = self.nlp(text)
-        concepts = []
-        
-        # Extract concepts based on specific patterns
-        for sent in doc.sents:
-            # Look for definition patterns
-            if any(token.text.lower() in ['is', 'are', 'refers', 'defines'] for token in sent):
-                concepts.append({
-                    'type': 'definition',
-                    'content': sent.text,
-                    'keywords': [token.text for token in sent if token.pos_ in ['NOUN', 'PROPN']]
-                })
-            
-            # Look for methodology patterns
-            if any(token.text.lower() in ['method', 'approach', 'technique', 'algorithm'] for token in sent):
-                concepts.append({
-                    'type': 'methodology',
-                    'content': sent.text,
-                    'keywords': [token.text for token in sent if token.pos_ in ['NOUN', 'PROPN']]
-                })
-            
-            # Look for result patterns
-            if any(token.text.lower() in ['result', 'conclusion', 'finding', 'shows'] for token in sent):
-                concepts.append({
-                    'type': 'result',
-                    'content': sent.text,
-                    'keywords': [token.text for token in sent if token.pos_ in ['NOUN', 'PROPN']]
-                })
-        
-        return concepts
+    def _extract_key_phrases(self, analysis):
+        """Extract key phrases (multi-word noun phrases and notable entities)"""
+        return analysis['key_phrases']
+
+    def _identify_concepts(self, analysis):
+        """Identify main concepts from the paper, keeping the strongest of each type"""
+        return rank_concepts(analysis['sentences'], self.max_concepts_per_type)
 
     def _prepare_game_data(self):
         """Prepare data structure for game generation"""
+        # Related concept pairs, shared by the simulation and puzzle builders
+        self.related_concepts = KeywordIndex(self.concepts, self.max_keyword_df).edges(self.max_edges_per_concept)
         return {
             'summary': self.summary,
             'key_phrases': self.key_phrases,
@@ -152,16 +200,14 @@ class PaperProcessor:
             simulation_data['elements'].append(element)
         
         # Create interactions between related concepts
-        for i, concept1 in enumerate(self.concepts):
-            for j, concept2 in enumerate(self.concepts[i+1:], i+1):
-                if any(keyword in concept2['keywords'] for keyword in concept1['keywords']):
-                    interaction = {
-                        'source': f"element_{i}",
-                        'target': f"element_{j}",
-                        'strength': 0.5,
-                        'type': 'attraction'
-                    }
-                    simulation_data['interactions'].append(interaction)
+        for i, j, _ in self.related_concepts:
+            interaction = {
+                'source': f"element_{i}",
+                'target': f"element_{j}",
+                'strength': 0.5,
+                'type': 'attraction'
+            }
+            simulation_data['interactions'].append(interaction)
         
         return simulation_data
 
@@ -179,25 +225,18 @@ class PaperProcessor:
                 'id': f"node_{i}",
                 'type': concept['type'],
                 'content': concept['content'],
-                'keywords': concept['keywords'],
-                'position': {
-                    'x': np.random.randint(100, 700),
-                    'y': np.random.randint(100, 500)
-                }
+                'keywords': concept['keywords']
             }
             puzzle_data['nodes'].append(node)
         
         # Create connections between related concepts
-        for i, concept1 in enumerate(self.concepts):
-            for j, concept2 in enumerate(self.concepts[i+1:], i+1):
-                shared_keywords = set(concept1['keywords']) & set(concept2['keywords'])
-                if shared_keywords:
-                    connection = {
-                        'source': f"node_{i}",
-                        'target': f"node_{j}",
-                        'label': list(shared_keywords)[0],
-                        'strength': len(shared_keywords)
-                    }
-                    puzzle_data['connections'].append(connection)
+        for i, j, shared_keywords in self.related_concepts:
+            connection = {
+                'source': f"node_{i}",
+                'target': f"node_{j}",
+                'label': shared_keywords[0],
+                'strength': len(shared_keywords)
+            }
+            puzzle_data['connections'].append(connection)
         
         return puzzle_data
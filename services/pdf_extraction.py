@@ -0,0 +1,131 @@
+"""
+Page-by-page text extraction for uploaded papers.
+Pages are yielded as soon as they are decoded so downstream NLP can start on
+the first page while later ones are still being extracted, either in this
+process or fanned out to a process pool.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+PDFMINER = 'pdfminer'
+PYMUPDF = 'pymupdf'
+BACKENDS = (PDFMINER, PYMUPDF)
+
+# Pages handed to a pool worker per task; small enough that the first pages
+# arrive quickly, large enough to amortize opening the document
+PAGES_PER_TASK = 4
+
+
+def _import_fitz():
+    """PyMuPDF's ``fitz`` module.
+
+    The unrelated ``fitz`` package on PyPI installs a module of the same name
+    without ``fitz.open``; raises ImportError if that is what is installed.
+    """
+    import fitz
+    if not hasattr(fitz, 'open'):
+        raise ImportError("the installed fitz module is not PyMuPDF")
+    return fitz
+
+
+def default_backend() -> str:
+    """PyMuPDF when installed (much faster), pdfminer otherwise."""
+    configured = os.environ.get('PAPERSCAPE_PDF_BACKEND')
+    if configured:
+        return configured
+    try:
+        _import_fitz()
+    except ImportError:
+        return PDFMINER
+    return PYMUPDF
+
+
+def default_workers() -> int:
+    return int(os.environ.get('PAPERSCAPE_PDF_WORKERS', 0))
+
+
+def _pdfminer_page_text(layout) -> str:
+    from pdfminer.layout import LTTextContainer
+    return ''.join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+
+def _iter_pdfminer(file_path: str, page_numbers: Optional[List[int]] = None) -> Iterator[str]:
+    from pdfminer.high_level import extract_pages
+    for layout in extract_pages(file_path, page_numbers=page_numbers):
+        yield _pdfminer_page_text(layout)
+
+
+def _iter_pymupdf(file_path: str, page_numbers: Optional[List[int]] = None) -> Iterator[str]:
+    fitz = _import_fitz()
+    doc = fitz.open(file_path)
+    try:
+        for number in (page_numbers if page_numbers is not None else range(doc.page_count)):
+            yield doc[number].get_text()
+    finally:
+        doc.close()
+
+
+def count_pages(file_path: str, backend: str) -> int:
+    if backend == PYMUPDF:
+        fitz = _import_fitz()
+        doc = fitz.open(file_path)
+        try:
+            return doc.page_count
+        finally:
+            doc.close()
+
+    from pdfminer.pdfpage import PDFPage
+    with open(file_path, 'rb') as file:
+        return sum(1 for _ in PDFPage.get_pages(file))
+
+
+def _extract_range(file_path: str, backend: str, start: int, stop: int) -> List[str]:
+    """Pool task: extract the text of pages [start, stop)."""
+    pages = list(range(start, stop))
+    if backend == PYMUPDF:
+        return list(_iter_pymupdf(file_path, pages))
+    return list(_iter_pdfminer(file_path, pages))
+
+
+def _iter_parallel(file_path: str, backend: str, workers: int) -> Iterator[str]:
+    total = count_pages(file_path, backend)
+    starts = range(0, total, PAGES_PER_TASK)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() yields in page order, as soon as each range is ready
+        results = executor.map(
+            _extract_range,
+            [file_path] * len(starts),
+            [backend] * len(starts),
+            starts,
+            [min(start + PAGES_PER_TASK, total) for start in starts]
+        )
+        for pages in results:
+            yield from pages
+
+
+def iter_pages(file_path: str, backend: Optional[str] = None, workers: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of each page of a PDF or plain-text paper in order.
+
+    Plain-text files are split into pages on form feeds. With ``workers`` > 1
+    PDF pages are decoded in a process pool.
+    """
+    if not file_path.endswith('.pdf'):
+        with open(file_path, 'r', encoding='utf-8') as file:
+            yield from file.read().split('\f')
+        return
+
+    backend = backend or default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {backend}")
+    workers = default_workers() if workers is None else workers
+
+    # Daemonic processes (pool workers before Python 3.9) can't start a pool
+    if workers > 1 and not multiprocessing.current_process().daemon:
+        yield from _iter_parallel(file_path, backend, workers)
+    elif backend == PYMUPDF:
+        yield from _iter_pymupdf(file_path)
+    else:
+        yield from _iter_pdfminer(file_path)
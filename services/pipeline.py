@@ -0,0 +1,63 @@
+"""
+End-to-end paper processing pipeline executed by background jobs.
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from services.paper_processor import PaperProcessor, PIPELINE_VERSION
+from services.game_generator import GameGenerator
+from services.job_queue import report_progress
+from services.model_registry import SPACY_MODEL, SUMMARIZER_MODEL
+from services.paper_cache import PaperCache
+from services.summarizer import ABSTRACTIVE
+from services.upload_spool import UploadSpool
+
+
+def pipeline_version() -> str:
+    """Identify the code and models that produce paper data, for cache keys."""
+    fingerprint = f"{PIPELINE_VERSION}:{SPACY_MODEL}:{SUMMARIZER_MODEL}"
+    return f"v{PIPELINE_VERSION}-{hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:8]}"
+
+
+def paper_id(digest: str, summary_mode: str) -> str:
+    """Identify a file processed with a given summary mode (also its cache key)."""
+    return f"{digest}-{summary_mode}"
+
+
+def describe_paper(paper_id: str, paper_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize a processed paper and list its games without generating them."""
+    games = [
+        {'id': f"{paper_id}_{game_type}", 'type': game_type, **info}
+        for game_type, info in GameGenerator.GAME_INFO.items()
+    ]
+    return {
+        'message': 'Paper processed successfully',
+        'paper_id': paper_id,
+        'summary': paper_data['summary'],
+        'key_phrases': paper_data['key_phrases'],
+        'games': games
+    }
+
+
+def process_paper_job(job_id: str, file_path: str, digest: str,
+                      summary_mode: str = ABSTRACTIVE,
+                      cache: Optional[PaperCache] = None,
+                      spool: Optional[UploadSpool] = None) -> Dict[str, Any]:
+    """Extract concepts from an uploaded paper and cache them for its games.
+
+    When ``spool`` is given, ``file_path`` is a lease on it and is released
+    once the paper has been read, whether or not processing succeeds.
+    """
+    try:
+        processor = PaperProcessor()
+        paper_data = processor.process_paper(file_path, summary_mode=summary_mode, progress=report_progress)
+    finally:
+        if spool is not None:
+            spool.release(file_path)
+
+    key = paper_id(digest, summary_mode)
+    if cache is not None:
+        cache.put(key, paper_data)
+
+    return describe_paper(key, paper_data)
@@ -0,0 +1,180 @@
+"""
+Static assets: content-fingerprinted names and vendored client libraries.
+Each file under the static folder gets a name that embeds a hash of its
+contents (css/styles.css -> css/styles.3f2a9c1b.css), so it can be cached
+forever and a changed file is fetched under a new name. Third-party client
+libraries are pinned here and vendored under static/vendor by
+vendor_assets.py.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Dict, List, Tuple
+
+from flask import send_from_directory, url_for
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_LENGTH = 8
+
+# Fingerprinted files never change, so browsers may keep them for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+VENDOR_DIR = 'vendor'
+
+# Pinned client libraries: files are fetched from ``source`` + filename
+VENDOR_LIBRARIES = {
+    'bootstrap': {
+        'version': '5.2.3',
+        'source': 'https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/',
+        'files': ['css/bootstrap.min.css', 'js/bootstrap.bundle.min.js'],
+    },
+    'font-awesome': {
+        'version': '6.0.0',
+        'source': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/',
+        # The stylesheet loads its fonts from ../webfonts/
+        'files': ['css/all.min.css'] + [
+            f"webfonts/fa-{font}.{extension}"
+            for font in ('solid-900', 'regular-400', 'brands-400', 'v4compatibility')
+            for extension in ('woff2', 'ttf')
+        ],
+    },
+    'animate.css': {
+        'version': '4.1.1',
+        'source': 'https://cdnjs.cloudflare.com/ajax/libs/animate.css/4.1.1/',
+        'files': ['animate.min.css'],
+    },
+    'gsap': {
+        'version': '3.9.1',
+        'source': 'https://cdnjs.cloudflare.com/ajax/libs/gsap/3.9.1/',
+        'files': ['gsap.min.js'],
+    },
+    'matter-js': {
+        'version': '0.18.0',
+        'source': 'https://cdnjs.cloudflare.com/ajax/libs/matter-js/0.18.0/',
+        'files': ['matter.min.js'],
+    },
+    'd3': {
+        'version': '7.3.0',
+        'source': 'https://cdn.jsdelivr.net/npm/d3@7.3.0/dist/',
+        'files': ['d3.min.js'],
+    },
+    'chart.js': {
+        'version': '3.7.0',
+        'source': 'https://cdn.jsdelivr.net/npm/chart.js@3.7.0/dist/',
+        'files': ['chart.min.js'],
+    },
+    'phaser': {
+        'version': '3.55.2',
+        'source': 'https://cdn.jsdelivr.net/npm/phaser@3.55.2/dist/',
+        'files': ['phaser.min.js'],
+    },
+    # plotly-latest.min.js has been frozen at 1.58.5
+    'plotly': {
+        'version': '1.58.5',
+        'source': 'https://cdn.plot.ly/',
+        'files': ['plotly-1.58.5.min.js'],
+    },
+    'socket.io': {
+        'version': '4.0.1',
+        'source': 'https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/',
+        'files': ['socket.io.js'],
+    },
+}
+
+# Libraries game.html loads for each game type (as in GameGenerator.GAME_INFO),
+# on top of the ones every game uses; puzzles are drawn as D3 concept maps
+GAME_SCRIPTS: Dict[str, List[Tuple[str, str]]] = {
+    'simulation': [('matter-js', 'matter.min.js')],
+    'puzzle': [('d3', 'd3.min.js')],
+}
+
+
+def file_digest(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def fingerprinted_name(filename: str, digest: str) -> str:
+    root, extension = os.path.splitext(filename)
+    return f"{root}.{digest[:FINGERPRINT_LENGTH]}{extension}"
+
+
+def build_manifest(static_folder: str) -> Dict[str, Dict[str, str]]:
+    """Map each static file (relative, '/'-separated) to its digest and fingerprinted name."""
+    manifest = {}
+    for dirpath, _, filenames in os.walk(static_folder):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            name = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            digest = file_digest(path)
+            manifest[name] = {'digest': digest, 'fingerprinted': fingerprinted_name(name, digest)}
+    return dict(sorted(manifest.items()))
+
+
+def use_fingerprinted_urls(app, manifest: Dict[str, Dict[str, str]]) -> None:
+    """Make url_for('static', filename=...) produce fingerprinted names."""
+    @app.url_defaults
+    def _fingerprint_static(endpoint, values):
+        if endpoint == 'static' and values.get('filename') in manifest:
+            values['filename'] = manifest[values['filename']]['fingerprinted']
+
+
+def serve_fingerprinted_static(app, max_age: int = IMMUTABLE_MAX_AGE) -> Dict[str, Dict[str, str]]:
+    """Serve static files under their fingerprinted names with immutable caching.
+
+    ``url_for('static', ...)`` produces fingerprinted names from then on.
+    Plain names are still served with Flask's usual caching, for files
+    referenced directly such as the fonts used by vendored stylesheets.
+    Returns the manifest.
+    """
+    manifest = build_manifest(app.static_folder)
+    originals = {entry['fingerprinted']: name for name, entry in manifest.items()}
+    use_fingerprinted_urls(app, manifest)
+    serve_plain = app.view_functions['static']
+
+    def static(filename):
+        original = originals.get(filename)
+        if original is None:
+            return serve_plain(filename=filename)
+        response = send_from_directory(app.static_folder, original, max_age=max_age)
+        response.cache_control.immutable = True
+        return response
+
+    app.view_functions['static'] = static
+    return manifest
+
+
+def vendor_path(library: str, filename: str) -> str:
+    """Path of a vendored library file relative to the static folder."""
+    return f"{VENDOR_DIR}/{library}/{VENDOR_LIBRARIES[library]['version']}/{filename}"
+
+
+def vendor_source(library: str, filename: str) -> str:
+    """Pinned CDN URL a vendored library file is fetched from."""
+    return VENDOR_LIBRARIES[library]['source'] + filename
+
+
+def register_vendor_assets(app) -> None:
+    """Add ``vendor_url(library, filename)`` to templates.
+
+    It links the vendored copy under the static folder, falling back to the
+    pinned CDN URL for files vendor_assets.py has not fetched yet.
+    """
+    missing = sorted({
+        library for library, entry in VENDOR_LIBRARIES.items() for filename in entry['files']
+        if not os.path.isfile(os.path.join(app.static_folder, *vendor_path(library, filename).split('/')))
+    })
+    if missing:
+        logger.warning("Serving %s from CDNs; run vendor_assets.py to serve them locally", ', '.join(missing))
+
+    @app.template_global()
+    def vendor_url(library: str, filename: str) -> str:
+        path = vendor_path(library, filename)
+        if os.path.isfile(os.path.join(app.static_folder, *path.split('/'))):
+            return url_for('static', filename=path)
+        return vendor_source(library, filename)
@@ -0,0 +1,182 @@
+"""
+Summarization stage for the paper pipeline.
+Abstractive summaries pack whole sentences into chunks that fit the model's
+token budget and run them through the transformer pipeline in batches,
+optionally reducing the chunk summaries hierarchically. Extractive summaries
+rank the parsed sentences with TextRank and need no transformer at all.
+"""
+
+import logging
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+ABSTRACTIVE = 'abstractive'
+EXTRACTIVE = 'extractive'
+SUMMARY_MODES = (ABSTRACTIVE, EXTRACTIVE)
+
+# Tokens reserved for the special tokens the model adds around each input
+TOKEN_MARGIN = 16
+DEFAULT_MAX_INPUT_TOKENS = 1024
+
+# TextRank's sentence-similarity matrix grows with the square of the
+# sentences that share keywords; longer documents are sampled down to this
+MAX_TEXTRANK_SENTENCES = 3000
+
+
+def _token_counter(summarizer) -> Callable[[List[str]], List[int]]:
+    """Count tokens with the pipeline's tokenizer, or estimate from words."""
+    tokenizer = getattr(summarizer, 'tokenizer', None)
+    if tokenizer is None:
+        return lambda texts: [int(len(text.split()) * 4 / 3) + 1 for text in texts]
+    return lambda texts: [len(ids) for ids in tokenizer(texts, add_special_tokens=False)['input_ids']]
+
+
+def _token_budget(summarizer) -> int:
+    tokenizer = getattr(summarizer, 'tokenizer', None)
+    max_length = getattr(tokenizer, 'model_max_length', DEFAULT_MAX_INPUT_TOKENS)
+    # Tokenizers without a configured limit report a huge sentinel value
+    if not max_length or max_length > 100000:
+        max_length = DEFAULT_MAX_INPUT_TOKENS
+    return max_length - TOKEN_MARGIN
+
+
+def chunk_sentences(sentences: Sequence[Dict], token_counts: Sequence[int], budget: int) -> List[str]:
+    """Pack consecutive sentences into chunks of at most ``budget`` tokens.
+
+    A chunk is closed early at a section boundary once it is at least half
+    full, so chunks follow the paper's structure where they can. Sentences
+    longer than the budget become chunks of their own and are truncated by
+    the pipeline.
+    """
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+    current_section = None
+
+    for sentence, tokens in zip(sentences, token_counts):
+        section = sentence.get('section')
+        section_break = section != current_section and current_tokens >= budget // 2
+        if current and (current_tokens + tokens > budget or section_break):
+            chunks.append(' '.join(current))
+            current, current_tokens = [], 0
+        current.append(sentence['text'])
+        current_tokens += tokens
+        current_section = section
+
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+
+def abstractive_summary(summarizer, sentences: Sequence[Dict], hierarchical: bool = True,
+                        batch_size: int = 8, max_length: int = 130, min_length: int = 30,
+                        max_rounds: int = 3) -> str:
+    """Summarize with the transformer pipeline, batching sentence-aligned chunks."""
+    count_tokens = _token_counter(summarizer)
+    budget = _token_budget(summarizer)
+
+    for _ in range(max_rounds):
+        texts = [sentence['text'] for sentence in sentences]
+        if not texts:
+            return ''
+        chunks = chunk_sentences(sentences, count_tokens(texts), budget)
+
+        shortest = min(count_tokens(chunks))
+        outputs = summarizer(
+            chunks,
+            max_length=max_length,
+            min_length=min(min_length, max(1, shortest // 2)),
+            do_sample=False,
+            truncation=True,
+            batch_size=batch_size
+        )
+        summaries = [output['summary_text'] for output in outputs]
+
+        # Summary of summaries until everything fits in a single chunk
+        if not hierarchical or len(chunks) == 1:
+            return ' '.join(summaries)
+        sentences = [{'text': summary} for summary in summaries]
+
+    return ' '.join(sentence['text'] for sentence in sentences)
+
+
+def textrank_scores(sentences: Sequence[Dict], damping: float = 0.85,
+                    iterations: int = 50, tolerance: float = 1e-6) -> np.ndarray:
+    """Score sentences by TextRank over their shared (lower-cased) keywords."""
+    vocabulary: Dict[str, int] = {}
+    rows, cols = [], []
+    for row, sentence in enumerate(sentences):
+        for word in set(keyword.lower() for keyword in sentence.get('keywords', [])):
+            rows.append(row)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    n = len(sentences)
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    # Sparse throughout: most sentence pairs share no keyword
+    incidence = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(n, max(len(vocabulary), 1))
+    )
+    overlap = (incidence @ incidence.T).tocoo()
+    off_diagonal = overlap.row != overlap.col
+    pair_rows, pair_cols = overlap.row[off_diagonal], overlap.col[off_diagonal]
+
+    # Normalize by sentence length as in the original TextRank similarity
+    log_lengths = np.log(np.maximum(np.asarray(incidence.sum(axis=1)).ravel(), 2.0))
+    weights = overlap.data[off_diagonal] / (log_lengths[pair_rows] + log_lengths[pair_cols])
+
+    out_weight = np.bincount(pair_rows, weights=weights, minlength=n)
+    transition = sparse.csr_matrix(
+        (weights / out_weight[pair_rows], (pair_rows, pair_cols)), shape=(n, n), dtype=np.float32
+    )
+
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tolerance:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def extractive_summary(sentences: Sequence[Dict], max_sentences: int = 6) -> str:
+    """Pick the highest ranked sentences and return them in document order."""
+    candidates = list(sentences)
+    if len(candidates) > MAX_TEXTRANK_SENTENCES:
+        # Evenly spaced, so every part of the document can be summarized
+        logger.info("Ranking %d of %d sentences for the extractive summary",
+                    MAX_TEXTRANK_SENTENCES, len(candidates))
+        picked = np.linspace(0, len(candidates) - 1, MAX_TEXTRANK_SENTENCES).astype(int)
+        candidates = [candidates[i] for i in picked]
+    if len(candidates) <= max_sentences:
+        return ' '.join(sentence['text'] for sentence in candidates)
+
+    scores = textrank_scores(candidates)
+    top = np.argsort(-scores, kind='stable')[:max_sentences]
+    return ' '.join(candidates[i]['text'] for i in sorted(top))
+
+
+def summarize(sentences: Sequence[Dict], mode: str = ABSTRACTIVE, summarizer_factory=None,
+              hierarchical: bool = True) -> str:
+    """Summarize parsed sentences with the requested mode.
+
+    ``summarizer_factory`` is only called for abstractive summaries, so the
+    transformer model is never loaded on hosts running extractive mode.
+    """
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode: {mode}")
+
+    if mode == ABSTRACTIVE:
+        try:
+            return abstractive_summary(summarizer_factory(), sentences, hierarchical=hierarchical)
+        except Exception as e:
+            logger.warning("Abstractive summary failed, falling back to extractive: %s", e)
+
+    return extractive_summary(sentences)
@@ -0,0 +1,159 @@
+"""
+Content-addressed spool for uploaded papers.
+Uploads are written to disk and hashed on the way, by the form parser itself
+(see SpoolWriter), so the file is written once and never re-read just to
+compute its digest. Identical uploads
+share one copy on disk; each job holds its own hard-linked lease on it, and
+the copy disappears when the last lease is released.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import time
+import uuid
+from typing import BinaryIO, Optional, Tuple
+
+CHUNK_SIZE = 1024 * 1024
+
+# Spool files older than this were left behind by crashed workers
+STALE_AFTER_SECONDS = 24 * 60 * 60
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds the spool's size limit."""
+
+
+class SpoolWriter(io.RawIOBase):
+    """Temporary file in the spool that hashes the data written to it.
+
+    Returned by ``Request._get_file_stream`` so the form parser writes
+    uploads straight into the spool. Writes must be sequential, as the
+    parser's are; the file is removed on close unless it was committed.
+    """
+
+    def __init__(self, root: str):
+        fd, self.name = tempfile.mkstemp(dir=root, suffix='.tmp')
+        self._file = os.fdopen(fd, 'w+b')
+        self._hasher = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._hasher.update(data)
+        return self._file.write(data)
+
+    def readinto(self, buffer) -> int:
+        return self._file.readinto(buffer)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def flush(self) -> None:
+        if not self._file.closed:
+            self._file.flush()
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._file.close()
+        super().close()
+        # Committed files were moved to their content and lease names
+        try:
+            os.remove(self.name)
+        except FileNotFoundError:
+            pass
+
+
+class UploadSpool:
+    def __init__(self, root: str, max_bytes: Optional[int] = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def _content_path(self, digest: str, extension: str) -> str:
+        return os.path.join(self.root, f"{digest}{extension}")
+
+    def writer(self) -> SpoolWriter:
+        """A new temporary file to write an upload into; see ``commit``."""
+        return SpoolWriter(self.root)
+
+    def commit(self, writer: SpoolWriter, extension: str = '') -> Tuple[str, str]:
+        """Add a fully written upload to the spool and return ``(digest, lease_path)``.
+
+        The lease is a private name for the file's contents that stays valid
+        until passed to ``release``, even if the same paper is uploaded and
+        released concurrently.
+        """
+        writer.flush()
+        digest = writer.hexdigest()
+        content_path = self._content_path(digest, extension)
+        lease_path = os.path.join(self.root, f"{digest}.{uuid.uuid4().hex}{extension}")
+        try:
+            # Same contents already spooled; keep that copy and drop ours
+            os.link(content_path, lease_path)
+            os.utime(lease_path)
+        except FileNotFoundError:
+            os.link(writer.name, lease_path)
+            os.replace(writer.name, content_path)
+        return digest, lease_path
+
+    def spool(self, stream: BinaryIO, extension: str = '') -> Tuple[str, str]:
+        """Copy a stream into the spool and return ``(digest, lease_path)``.
+
+        For uploads that did not come through the form parser. Raises
+        UploadTooLarge once more than ``max_bytes`` have been read.
+        """
+        size = 0
+        with self.writer() as writer:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                size += len(chunk)
+                if self.max_bytes is not None and size > self.max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds {self.max_bytes} bytes")
+                writer.write(chunk)
+            return self.commit(writer, extension)
+
+    def release(self, lease_path: str) -> None:
+        """Drop a lease, removing the spooled contents if it was the last one."""
+        digest, _, rest = os.path.basename(lease_path).partition('.')
+        _, _, extension = rest.partition('.')
+        content_path = self._content_path(digest, f".{extension}" if extension else '')
+        try:
+            os.remove(lease_path)
+        except FileNotFoundError:
+            pass
+
+        try:
+            if os.stat(content_path).st_nlink <= 1:
+                # A lease taken after this check has its own link, so
+                # removing the shared name can't pull the file from under it
+                os.remove(content_path)
+        except FileNotFoundError:
+            pass
+
+    def sweep(self, max_age: float = STALE_AFTER_SECONDS) -> int:
+        """Remove spool files not touched for ``max_age`` seconds."""
+        cutoff = time.time() - max_age
+        removed = 0
+        for entry in os.scandir(self.root):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
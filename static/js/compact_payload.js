@@ -0,0 +1,34 @@
+// Decoder for the compact game format served by /api/game/<id>?format=compact
+// (see services/game_payload.py). Long strings are sent once in a table and
+// referenced as "~<index>"; inline strings starting with "~" are escaped as "~~".
+function decodeCompactGame(payload) {
+    if (!payload || payload.format !== 'compact') {
+        return payload;
+    }
+    if (payload.version !== 1) {
+        throw new Error(`Unsupported compact game version: ${payload.version}`);
+    }
+
+    const strings = payload.strings;
+    const decode = (value) => {
+        if (typeof value === 'string') {
+            if (!value.startsWith('~')) {
+                return value;
+            }
+            const rest = value.slice(1);
+            return rest.startsWith('~') ? rest : strings[Number(rest)];
+        }
+        if (Array.isArray(value)) {
+            return value.map(decode);
+        }
+        if (value !== null && typeof value === 'object') {
+            const decoded = {};
+            for (const [key, item] of Object.entries(value)) {
+                decoded[key] = decode(item);
+            }
+            return decoded;
+        }
+        return value;
+    };
+    return decode(payload.data);
+}
@@ -0,0 +1,78 @@
+"""
+Fetch the pinned client libraries into static/vendor.
+
+Each library in services.static_assets.VENDOR_LIBRARIES is stored under
+static/vendor/<library>/<version>/, so bumping a version never overwrites
+the files of the previous one. Files already present are left alone.
+
+Usage: python vendor_assets.py [--force]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import urllib.request
+
+from services.static_assets import VENDOR_DIR, VENDOR_LIBRARIES, vendor_path, vendor_source
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+
+def fetch(url: str, destination: str) -> None:
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(destination), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file, urllib.request.urlopen(url, timeout=60) as response:
+            shutil.copyfileobj(response, file)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def prune(keep) -> int:
+    """Remove vendored files that no pinned library uses any more."""
+    removed = 0
+    for dirpath, _, filenames in os.walk(os.path.join(STATIC_DIR, VENDOR_DIR), topdown=False):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if os.path.relpath(path, STATIC_DIR).replace(os.sep, '/') not in keep:
+                os.remove(path)
+                removed += 1
+        if not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
+
+
+def vendor(force: bool = False):
+    """Fetch missing (or, with ``force``, all) pinned files and prune stale ones.
+
+    Returns (fetched, total, removed) file counts.
+    """
+    keep = set()
+    fetched = 0
+    for library, entry in VENDOR_LIBRARIES.items():
+        for filename in entry['files']:
+            path = vendor_path(library, filename)
+            keep.add(path)
+            destination = os.path.join(STATIC_DIR, *path.split('/'))
+            if force or not os.path.isfile(destination):
+                fetch(vendor_source(library, filename), destination)
+                fetched += 1
+
+    return fetched, len(keep), prune(keep)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--force', action='store_true', help='fetch every file again')
+    args = parser.parse_args()
+
+    fetched, total, removed = vendor(args.force)
+    print(f"Fetched {fetched} of {total} vendored files; removed {removed} stale files")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,15 @@ import os
 project_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_dir)
 
+# Production: gunicorn -c gunicorn.conf.py wsgi:application
 from app import app as application
+from services.model_registry import model_registry
+
+# Load models once before the server forks its workers so they share the
+# memory copy-on-write instead of each loading their own copy
+if application.config['PRELOAD_MODELS']:
+    model_registry.preload(application.config['PRELOADED_MODELS'])
+    model_registry.prepare_for_fork()
 
 if __name__ == '__main__':
     application.run()